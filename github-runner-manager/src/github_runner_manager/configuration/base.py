@@ -21,7 +21,7 @@ logger = logging.getLogger(__name__)
 # The github-runner-manager needs a input representing the user for process execution due to as a
 # library the user needs to be a hardcoded value. With the github-runner-manager as application,
 # user would be the current user running the application.
-@dataclass
+@dataclass(slots=True)
 class UserInfo:
     """The user to run the reactive process.
 
@@ -129,6 +129,16 @@ class ProxyConfig(BaseModel):
     https: Optional[AnyHttpUrl]
     no_proxy: Optional[str]
 
+    class Config:  # pylint: disable=too-few-public-methods
+        """Pydantic model configuration.
+
+        Attributes:
+            copy_on_model_validation: Reuse the instance, instead of copying it, when it is used
+                as a field of another model.
+        """
+
+        copy_on_model_validation = "none"
+
     @property
     def proxy_address(self) -> Optional[str]:
         """Return the address of the proxy."""
@@ -180,6 +190,16 @@ class SSHDebugConnection(BaseModel):
     local_proxy_host: str = "127.0.0.1"
     local_proxy_port: int = 3129
 
+    class Config:  # pylint: disable=too-few-public-methods
+        """Pydantic model configuration.
+
+        Attributes:
+            copy_on_model_validation: Reuse the instance, instead of copying it, when it is used
+                as a field of another model.
+        """
+
+        copy_on_model_validation = "none"
+
 
 class RepoPolicyComplianceConfig(BaseModel):
     """Configuration for the repo policy compliance service.
@@ -79,11 +79,11 @@ def parse_github_path(path_str: str, runner_group: str) -> GitHubPath:
         organization with runner group information.
     """
     if "/" in path_str:
-        paths = tuple(segment for segment in path_str.split("/") if segment)
-        if len(paths) != 2:
+        owner, _, repo = path_str.strip("/").partition("/")
+        repo = repo.lstrip("/")
+        if not owner or not repo or "/" in repo:
             # TODO: create custom error
             raise ValueError(f"Invalid path configuration {path_str}")
-        owner, repo = paths
         return GitHubRepo(owner=owner, repo=repo)
     return GitHubOrg(org=path_str, group=runner_group)
 
@@ -10,6 +10,7 @@ import dataclasses
 import getpass
 import grp
 import json
+import logging
 import os
 from dataclasses import dataclass
 from threading import Lock
@@ -100,8 +101,10 @@ def get_lock() -> Lock:
         The lock.
     """
     if _lock is not None:
-        lock_state = "locked" if _lock.locked() else "unlocked"
-        app.logger.info("Attempting to acquire the lock: %s", lock_state)
+        # The lock state is only introspected for logging.
+        if app.logger.isEnabledFor(logging.INFO):
+            lock_state = "locked" if _lock.locked() else "unlocked"
+            app.logger.info("Attempting to acquire the lock: %s", lock_state)
         return _lock
     raise LockError("Lock not configured")
 
@@ -4,7 +4,7 @@
 """Module containing the main classes for business logic."""
 
 import secrets
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 
 INSTANCE_SUFFIX_LENGTH = 12
 
@@ -111,7 +111,48 @@ class InstanceID:
         Raises:
             InstanceIDInvalidError: If the instance name is not valid (too long).
         """
-        suffix = secrets.token_hex(INSTANCE_SUFFIX_LENGTH // 2)
+        return cls._build_with_suffix(
+            prefix, reactive, secrets.token_hex(INSTANCE_SUFFIX_LENGTH // 2)
+        )
+
+    @classmethod
+    def build_many(cls, prefix: str, num: int, reactive: bool = False) -> list["InstanceID"]:
+        """Generate several InstanceIDs for runners.
+
+        The random suffixes are drawn from a single call to the random source. See build.
+
+        Args:
+           prefix: Prefix for the InstanceIDs.
+           num: Number of InstanceIDs to generate.
+           reactive: If the instance IDs to generate are for reactive runners.
+
+        Returns:
+            Instance IDs of the runners.
+        """
+        suffix_bytes = INSTANCE_SUFFIX_LENGTH // 2
+        random_bytes = secrets.token_bytes(suffix_bytes * num)
+        return [
+            cls._build_with_suffix(
+                prefix, reactive, random_bytes[i * suffix_bytes : (i + 1) * suffix_bytes].hex()
+            )
+            for i in range(num)
+        ]
+
+    @classmethod
+    def _build_with_suffix(cls, prefix: str, reactive: bool, suffix: str) -> "InstanceID":
+        """Create an InstanceID for a runner with the given suffix.
+
+        Args:
+           prefix: Prefix for the InstanceID.
+           reactive: If the instance ID is for a reactive runner.
+           suffix: Random suffix for the InstanceID.
+
+        Returns:
+            Instance ID of the runner.
+
+        Raises:
+            InstanceIDInvalidError: If the instance name is not valid (too long).
+        """
         instance_id = cls(prefix=prefix, reactive=reactive, suffix=suffix)
         # By default, for OpenStack with MySQL, the limit is 64 characters.
         if len(instance_id.name) > 64:
@@ -178,7 +219,12 @@ class RunnerMetadata:
         Returns:
             metadata as a dict.
         """
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        metadata = {"platform_name": self.platform_name}
+        if self.runner_id is not None:
+            metadata["runner_id"] = self.runner_id
+        if self.url is not None:
+            metadata["url"] = self.url
+        return metadata
 
 
 @dataclass
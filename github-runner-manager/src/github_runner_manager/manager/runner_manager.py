@@ -4,12 +4,16 @@
 """Module for managing the GitHub self-hosted runners hosted on cloud instances."""
 
 import copy
+import functools
+import itertools
 import logging
 import time
+from collections import Counter
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum, auto
-from multiprocessing import Pool
-from typing import Iterator, Sequence, Type, cast
+from multiprocessing.pool import ThreadPool
+from typing import Iterable, Iterator, Sequence, Type, cast
 
 from github_runner_manager import constants
 from github_runner_manager.errors import GithubMetricsError, PlatformApiError, RunnerError
@@ -24,6 +28,7 @@ from github_runner_manager.metrics import events as metric_events
 from github_runner_manager.metrics import github as github_metrics
 from github_runner_manager.metrics import runner as runner_metrics
 from github_runner_manager.metrics.runner import RunnerMetrics
+from github_runner_manager.metrics.type import GithubJobMetrics
 from github_runner_manager.platform.platform_provider import (
     PlatformProvider,
     PlatformRunnerState,
@@ -37,6 +42,11 @@ logger = logging.getLogger(__name__)
 # the time waiting before each health check against the platform provider.
 RUNNER_CREATION_WAITING_TIMES = (60, 60, 120, 240, 480)
 
+# The removal token of GitHub is valid for one hour. The cached token is reused for 10 minutes,
+# so it has at least 50 minutes left when used. A token rejected by the runner removal script is
+# not reported to the manager, so the short reuse also bounds how long such a token is retried.
+REMOVAL_TOKEN_CACHE_SECONDS = 600
+
 IssuedMetricEventsStats = dict[Type[metric_events.Event], int]
 
 
@@ -52,7 +62,7 @@ class FlushMode(Enum):
     FLUSH_BUSY = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class RunnerInstance:
     """Represents an instance of runner.
 
@@ -84,7 +94,9 @@ class RunnerInstance:
         self.metadata = cloud_instance.metadata
         self.health = cloud_instance.health
         self.github_state = (
-            PlatformRunnerState.from_runner(github_info) if github_info is not None else None
+            PlatformRunnerState.from_status(github_info.status, github_info.busy)
+            if github_info is not None
+            else None
         )
         self.cloud_state = cloud_instance.state
 
@@ -117,6 +129,10 @@ class RunnerManager:
         self.name_prefix = self._cloud.name_prefix
         self._platform: PlatformProvider = platform_provider
         self._labels = labels
+        # This labels are added by default by the github agent, but with JIT tokens
+        # we have to add them manually.
+        self._runner_labels = [*labels, *constants.GITHUB_DEFAULT_LABELS]
+        self._cached_removal_token: tuple[str, float] | None = None
 
     def create_runners(
         self, num: int, metadata: RunnerMetadata, reactive: bool = False
@@ -131,23 +147,21 @@ class RunnerManager:
         Returns:
             List of instance ID of the runners.
         """
+        if num <= 0:
+            return tuple()
         logger.info("Creating %s runners", num)
 
-        labels = list(self._labels)
-        # This labels are added by default by the github agent, but with JIT tokens
-        # we have to add them manually.
-        labels += constants.GITHUB_DEFAULT_LABELS
         create_runner_args = [
             RunnerManager._CreateRunnerArgs(
+                instance_id=instance_id,
                 cloud_runner_manager=self._cloud,
                 platform_provider=self._platform,
                 # The metadata may be manipulated when creating the runner, as the platform may
                 # assign for example the id of the runner if it was not provided.
                 metadata=copy.copy(metadata),
-                labels=labels,
-                reactive=reactive,
+                labels=self._runner_labels,
             )
-            for _ in range(num)
+            for instance_id in InstanceID.build_many(self._cloud.name_prefix, num, reactive)
         ]
         return RunnerManager._spawn_runners(create_runner_args)
 
@@ -155,6 +169,7 @@ class RunnerManager:
         self,
         github_states: Sequence[PlatformRunnerState] | None = None,
         cloud_states: Sequence[CloudRunnerState] | None = None,
+        limit: int | None = None,
     ) -> tuple[RunnerInstance]:
         """Get information on runner filter by state.
 
@@ -165,22 +180,48 @@ class RunnerManager:
                 states will be included.
             cloud_states: Filter for the runners with these cloud states. If None all states
                 will be included.
+            limit: The maximum number of runners to return. If None all runners will be
+                included.
 
         Returns:
             Information on the runners.
         """
         logger.info("Getting runners...")
-        github_infos = self._platform.get_runners(github_states)
-        cloud_infos = self._cloud.get_runners(cloud_states)
+        # The platform and the cloud are independent, fetch both concurrently.
+        with ThreadPool(processes=1) as pool:
+            github_infos_result = pool.apply_async(self._platform.get_runners, (github_states,))
+            cloud_infos = self._cloud.get_runners(cloud_states)
+            github_infos = github_infos_result.get()
+        github_states_set = frozenset(github_states) if github_states is not None else None
+        cloud_states_set = frozenset(cloud_states) if cloud_states is not None else None
         github_infos_map = {info.instance_id.name: info for info in github_infos}
-        cloud_infos_map = {info.name: info for info in cloud_infos}
         logger.info(
-            "Found following runners: %s", cloud_infos_map.keys() | github_infos_map.keys()
+            "Found following runners: %s",
+            {info.name for info in cloud_infos} | github_infos_map.keys(),
         )
 
-        runner_names = cloud_infos_map.keys() & github_infos_map.keys()
-        cloud_only = cloud_infos_map.keys() - runner_names
-        github_only = github_infos_map.keys() - runner_names
+        # Single pass over the cloud runners, matching them with the platform runners and
+        # filtering them. The platform runners left in the map are not on the cloud.
+        cloud_only: set[str] = set()
+        runner_instances: list[RunnerInstance] = []
+        for cloud_info in cloud_infos:
+            github_info = github_infos_map.pop(cloud_info.name, None)
+            if github_info is None:
+                cloud_only.add(cloud_info.name)
+            if limit is not None and len(runner_instances) >= limit:
+                continue
+            # The filters are checked as early as possible, to avoid building runner instances
+            # that are discarded.
+            if cloud_states_set is not None and cloud_info.state not in cloud_states_set:
+                continue
+            if github_states_set is not None and github_info is None:
+                continue
+            runner = RunnerInstance(cloud_info, github_info)
+            if github_states_set is not None and runner.github_state not in github_states_set:
+                continue
+            runner_instances.append(runner)
+
+        github_only = github_infos_map.keys()
         if cloud_only:
             logger.warning(
                 "Found runner instance on cloud but not registered on GitHub: %s", cloud_only
@@ -188,25 +229,8 @@ class RunnerManager:
         if github_only:
             logger.warning(
                 "Found self-hosted runner on GitHub but no matching runner instance on cloud: %s",
-                github_only,
+                set(github_only),
             )
-
-        runner_instances: list[RunnerInstance] = [
-            RunnerInstance(
-                cloud_infos_map[name], github_infos_map[name] if name in github_infos_map else None
-            )
-            for name in cloud_infos_map.keys()
-        ]
-        if cloud_states is not None:
-            runner_instances = [
-                runner for runner in runner_instances if runner.cloud_state in cloud_states
-            ]
-        if github_states is not None:
-            runner_instances = [
-                runner
-                for runner in runner_instances
-                if runner.github_state is not None and runner.github_state in github_states
-            ]
         return cast(tuple[RunnerInstance], tuple(runner_instances))
 
     def delete_runners(self, num: int) -> IssuedMetricEventsStats:
@@ -219,11 +243,11 @@ class RunnerManager:
             Stats on metrics events issued during the deletion of runners.
         """
         logger.info("Deleting %s number of runners", num)
-        runners_list = self.get_runners()[:num]
+        runners_list = self.get_runners(limit=num)
         runner_names = [runner.name for runner in runners_list]
         logger.info("Deleting runners: %s", runner_names)
-        remove_token = self._platform.get_removal_token()
-        return self._delete_runners(runners=runners_list, remove_token=remove_token)
+        with self._removal_token() as remove_token:
+            return self._delete_runners(runners=runners_list, remove_token=remove_token)
 
     def flush_runners(
         self, flush_mode: FlushMode = FlushMode.FLUSH_IDLE
@@ -249,9 +273,9 @@ class RunnerManager:
         busy = False
         if flush_mode == FlushMode.FLUSH_BUSY:
             busy = True
-        remove_token = self._platform.get_removal_token()
-        stats = self._cloud.flush_runners(remove_token, busy)
-        return self._issue_runner_metrics(metrics=stats)
+        with self._removal_token() as remove_token:
+            stats = self._cloud.flush_runners(remove_token, busy)
+            return self._issue_runner_metrics(metrics=stats)
 
     def cleanup(self) -> IssuedMetricEventsStats:
         """Run cleanup of the runners and other resources.
@@ -260,9 +284,38 @@ class RunnerManager:
             Stats on metrics events issued during the cleanup of runners.
         """
         self._cleanup_github_offline_runners()
-        remove_token = self._platform.get_removal_token()
-        deleted_runner_metrics = self._cloud.cleanup(remove_token)
-        return self._issue_runner_metrics(metrics=deleted_runner_metrics)
+        with self._removal_token() as remove_token:
+            deleted_runner_metrics = self._cloud.cleanup(remove_token)
+            return self._issue_runner_metrics(metrics=deleted_runner_metrics)
+
+    @contextmanager
+    def _removal_token(self) -> Iterator[str]:
+        """Use the removal token of the platform.
+
+        The token is cached for REMOVAL_TOKEN_CACHE_SECONDS to avoid a request to the platform
+        for each operation deleting runners. The cached token is dropped if the operation using
+        it fails, as the token could have been the cause of the failure.
+
+        Raises:
+            RunnerError: If the operation using the token failed.
+            PlatformApiError: If the operation using the token failed on the platform.
+
+        Yields:
+            The removal token.
+        """
+        token = None
+        if self._cached_removal_token is not None:
+            cached_token, fetched_at = self._cached_removal_token
+            if time.monotonic() - fetched_at < REMOVAL_TOKEN_CACHE_SECONDS:
+                token = cached_token
+        if token is None:
+            token = self._platform.get_removal_token()
+            self._cached_removal_token = (token, time.monotonic())
+        try:
+            yield token
+        except (RunnerError, PlatformApiError):
+            self._cached_removal_token = None
+            raise
 
     def _cleanup_github_offline_runners(self) -> None:
         """Run cleanup of github runners in offline state."""
@@ -284,11 +337,12 @@ class RunnerManager:
         }
 
         github_runners_offline = self._platform.get_runners([PlatformRunnerState.OFFLINE])
-        github_runners_to_delete = []
+        # Keyed by instance ID, so a runner is never requested to be deleted twice.
+        github_runners_to_delete: dict[InstanceID, SelfHostedRunner] = {}
         for github_runner in github_runners_offline:
             # Delete all non-reactive runners
             if not github_runner.instance_id.reactive:
-                github_runners_to_delete.append(github_runner)
+                github_runners_to_delete[github_runner.instance_id] = github_runner
                 continue
 
             # reactive runners.
@@ -303,22 +357,23 @@ class RunnerManager:
                 and cloud_runner.health == HealthState.HEALTHY
             ):
                 continue
-            github_runners_to_delete.append(github_runner)
+            github_runners_to_delete[github_runner.instance_id] = github_runner
+        if not github_runners_to_delete:
+            return
         logger.info(
             "Offline github runners to delete: %s:",
-            [runner.instance_id for runner in github_runners_to_delete],
+            list(github_runners_to_delete.keys()),
         )
-        self._platform.delete_runners(github_runners_to_delete)
+        self._platform.delete_runners(list(github_runners_to_delete.values()))
 
     @staticmethod
     def _spawn_runners(
         create_runner_args_sequence: Sequence["RunnerManager._CreateRunnerArgs"],
     ) -> tuple[InstanceID, ...]:
-        """Spawn runners in parallel using multiprocessing.
+        """Spawn runners in parallel using a thread pool.
 
-        Multiprocessing is only used if there are more than one runner to spawn. Otherwise,
-        the runner is created in the current process, which is required for reactive,
-        where we don't assume to spawn another process inside the reactive process.
+        The thread pool is only used if there are more than one runner to spawn. Otherwise,
+        the runner is created in the current thread, which is the case for reactive runners.
 
         The length of the create_runner_args is number _create_runner invocation, and therefore the
         number of runner spawned.
@@ -331,21 +386,27 @@ class RunnerManager:
         """
         num = len(create_runner_args_sequence)
 
+        if num == 0:
+            return tuple()
         if num == 1:
-            try:
-                return (RunnerManager._create_runner(create_runner_args_sequence[0]),)
-            except (RunnerError, PlatformApiError):
-                logger.exception("Failed to spawn a runner.")
-                return tuple()
+            instance_id = RunnerManager._try_create_runner(create_runner_args_sequence[0])
+            return (instance_id,) if instance_id is not None else tuple()
 
-        return RunnerManager._spawn_runners_using_multiprocessing(create_runner_args_sequence, num)
+        return RunnerManager._spawn_runners_using_thread_pool(create_runner_args_sequence, num)
 
     @staticmethod
-    def _spawn_runners_using_multiprocessing(
+    def _spawn_runners_using_thread_pool(
         create_runner_args_sequence: Sequence["RunnerManager._CreateRunnerArgs"], num: int
     ) -> tuple[InstanceID, ...]:
         """Parallel spawn of runners.
 
+        The creation of a runner is dominated by network I/O against the platform and the cloud
+        provider, so threads are used instead of processes. This avoids forking and pickling the
+        managers for each runner.
+
+        The runners that failed to be created are deleted from the platform in a single request
+        once all the creations are done.
+
         The length of the create_runner_args is number _create_runner invocation, and therefore the
         number of runner spawned.
 
@@ -356,21 +417,28 @@ class RunnerManager:
         Returns:
             A tuple of instance ID's of runners spawned.
         """
-        instance_id_list = []
-        with Pool(processes=min(num, 20)) as pool:
-            jobs = pool.imap_unordered(
-                func=RunnerManager._create_runner, iterable=create_runner_args_sequence
+        failed_platform_runners: list[SelfHostedRunner] = []
+        with ThreadPool(processes=min(num, 20)) as pool:
+            instance_ids = pool.map(
+                func=functools.partial(
+                    RunnerManager._try_create_runner,
+                    failed_platform_runners=failed_platform_runners,
+                ),
+                iterable=create_runner_args_sequence,
+            )
+
+        if failed_platform_runners:
+            logger.warning(
+                "Deleting runners %s from platform after creation failed",
+                [runner.instance_id for runner in failed_platform_runners],
             )
-            for _ in range(num):
-                try:
-                    instance_id = next(jobs)
-                except (RunnerError, PlatformApiError):
-                    logger.exception("Failed to spawn a runner.")
-                except StopIteration:
-                    break
-                else:
-                    instance_id_list.append(instance_id)
-        return tuple(instance_id_list)
+            try:
+                create_runner_args_sequence[0].platform_provider.delete_runners(
+                    failed_platform_runners
+                )
+            except PlatformApiError:
+                logger.exception("Failed to delete runners from platform after creation failed")
+        return tuple(instance_id for instance_id in instance_ids if instance_id is not None)
 
     def _delete_runners(
         self, runners: Sequence[RunnerInstance], remove_token: str
@@ -384,88 +452,178 @@ class RunnerManager:
         Returns:
             Stats on metrics events issued during the deletion of runners.
         """
-        runner_metrics_list = []
-        for runner in runners:
-            deleted_runner_metrics = self._cloud.delete_runner(
+        if not runners:
+            return {}
+        return self._issue_runner_metrics(
+            metrics=self._iter_delete_runners(runners=runners, remove_token=remove_token)
+        )
+
+    def _iter_delete_runners(
+        self, runners: Sequence[RunnerInstance], remove_token: str
+    ) -> Iterator[RunnerMetrics]:
+        """Delete list of runners, yielding the metrics of each runner as it is deleted.
+
+        The runners are deleted in parallel using a thread pool, as each deletion is dominated
+        by the network I/O against the cloud provider.
+
+        Args:
+            runners: The runners to delete.
+            remove_token: The token for removing self-hosted runners.
+
+        Raises:
+            RunnerError: If the deletion of a runner failed.
+
+        Yields:
+            The metrics collected during the deletion of the runners.
+        """
+
+        def _delete_runner(runner: RunnerInstance) -> RunnerMetrics | None:
+            """Delete a single runner.
+
+            Args:
+                runner: The runner to delete.
+
+            Returns:
+                Any metrics collected during the deletion of the runner.
+            """
+            return self._cloud.delete_runner(
                 instance_id=runner.instance_id, remove_token=remove_token
             )
-            if deleted_runner_metrics is not None:
-                runner_metrics_list.append(deleted_runner_metrics)
-        return self._issue_runner_metrics(metrics=iter(runner_metrics_list))
 
-    def _issue_runner_metrics(self, metrics: Iterator[RunnerMetrics]) -> IssuedMetricEventsStats:
+        with ThreadPool(processes=min(len(runners), 10)) as pool:
+            for deleted_runner_metrics in pool.imap_unordered(
+                func=_delete_runner, iterable=runners
+            ):
+                if deleted_runner_metrics is not None:
+                    yield deleted_runner_metrics
+
+    def _issue_runner_metrics(self, metrics: Iterable[RunnerMetrics]) -> IssuedMetricEventsStats:
         """Issue runner metrics.
 
+        The metrics are consumed as they are produced. The job metrics are requested to the
+        platform in parallel using a thread pool, while the events are issued sequentially.
+
         Args:
             metrics: Runner metrics to issue.
 
         Returns:
             Stats on runner metrics issued.
         """
-        total_stats: IssuedMetricEventsStats = {}
-
-        for extracted_metrics in metrics:
-            job_metrics = None
-
-            # We need a guard because pre-job metrics may not be available for idle runners
-            # that are deleted.
-            if extracted_metrics.pre_job:
-                try:
-                    job_metrics = github_metrics.job(
-                        platform_provider=self._platform,
-                        pre_job_metrics=extracted_metrics.pre_job,
-                        metadata=extracted_metrics.metadata,
-                        runner=extracted_metrics.instance_id,
-                    )
-                except GithubMetricsError:
-                    logger.exception(
-                        "Failed to calculate job metrics for %s",
-                        extracted_metrics.instance_id,
-                    )
-            else:
-                logger.debug(
-                    "No pre-job metrics found for %s, will not calculate job metrics.",
-                    extracted_metrics.instance_id,
+        metrics = iter(metrics)
+        first_metrics = next(metrics, None)
+        if first_metrics is None:
+            return {}
+
+        def _with_job_metrics(
+            extracted_metrics: RunnerMetrics,
+        ) -> tuple[RunnerMetrics, GithubJobMetrics | None]:
+            """Pair the runner metrics with its job metrics.
+
+            Args:
+                extracted_metrics: The metrics extracted from the runner.
+
+            Returns:
+                The runner metrics and the job metrics.
+            """
+            return extracted_metrics, self._get_job_metrics(extracted_metrics)
+
+        total_stats: Counter[Type[metric_events.Event]] = Counter()
+        with ThreadPool(processes=8) as pool:
+            for extracted_metrics, job_metrics in pool.imap(
+                func=_with_job_metrics, iterable=itertools.chain((first_metrics,), metrics)
+            ):
+                issued_events = runner_metrics.issue_events(
+                    runner_metrics=extracted_metrics,
+                    job_metrics=job_metrics,
+                    flavor=self.manager_name,
                 )
-            issued_events = runner_metrics.issue_events(
-                runner_metrics=extracted_metrics,
-                job_metrics=job_metrics,
-                flavor=self.manager_name,
-            )
 
-            for event_type in issued_events:
-                total_stats[event_type] = total_stats.get(event_type, 0) + 1
+                total_stats.update(issued_events)
 
-        return total_stats
+        return dict(total_stats)
+
+    def _get_job_metrics(self, extracted_metrics: RunnerMetrics) -> GithubJobMetrics | None:
+        """Get the job metrics of a runner from the platform.
+
+        Args:
+            extracted_metrics: The metrics extracted from the runner.
+
+        Returns:
+            The job metrics, or None if they are not available.
+        """
+        # We need a guard because pre-job metrics may not be available for idle runners
+        # that are deleted.
+        if not extracted_metrics.pre_job:
+            logger.debug(
+                "No pre-job metrics found for %s, will not calculate job metrics.",
+                extracted_metrics.instance_id,
+            )
+            return None
+        try:
+            return github_metrics.job(
+                platform_provider=self._platform,
+                pre_job_metrics=extracted_metrics.pre_job,
+                metadata=extracted_metrics.metadata,
+                runner=extracted_metrics.instance_id,
+            )
+        except GithubMetricsError:
+            logger.exception(
+                "Failed to calculate job metrics for %s",
+                extracted_metrics.instance_id,
+            )
+            return None
 
     @dataclass
     class _CreateRunnerArgs:
         """Arguments for the _create_runner function.
 
-        These arguments are used in the forked processes and should be reviewed.
+        These arguments are shared with the worker threads of the pool and should be reviewed.
 
         Attrs:
+            instance_id: The instance ID of the runner to create.
             cloud_runner_manager: For managing the cloud instance of the runner.
             platform_provider: To manage self-hosted runner on the Platform side.
             metadata: Metadata for the runner to create.
             labels: List of labels to add to the runners.
-            reactive: If the runner is reactive.
         """
 
+        instance_id: InstanceID
         cloud_runner_manager: CloudRunnerManager
         platform_provider: PlatformProvider
         metadata: RunnerMetadata
         labels: list[str]
-        reactive: bool
 
     @staticmethod
-    def _create_runner(args: _CreateRunnerArgs) -> InstanceID:
+    def _try_create_runner(
+        args: _CreateRunnerArgs, failed_platform_runners: list[SelfHostedRunner] | None = None
+    ) -> InstanceID | None:
+        """Create a single runner, logging the errors instead of raising them.
+
+        Args:
+            args: The arguments.
+            failed_platform_runners: See _create_runner.
+
+        Returns:
+            The instance ID of the runner created, or None if the creation failed.
+        """
+        try:
+            return RunnerManager._create_runner(args, failed_platform_runners)
+        except (RunnerError, PlatformApiError):
+            logger.exception("Failed to spawn a runner.")
+            return None
+
+    @staticmethod
+    def _create_runner(
+        args: _CreateRunnerArgs, failed_platform_runners: list[SelfHostedRunner] | None = None
+    ) -> InstanceID:
         """Create a single runner.
 
-        This is a staticmethod for usage with multiprocess.Pool.
+        This is a staticmethod for usage with the ThreadPool.
 
         Args:
             args: The arguments.
+            failed_platform_runners: If provided, the platform runner of a failed creation is
+                appended to it for a later deletion, instead of being deleted right away.
 
         Returns:
             The instance ID of the runner created.
@@ -473,7 +631,7 @@ class RunnerManager:
         Raises:
             RunnerError: On error creating OpenStack runner.
         """
-        instance_id = InstanceID.build(args.cloud_runner_manager.name_prefix, args.reactive)
+        instance_id = args.instance_id
         runner_context, github_runner = args.platform_provider.get_runner_context(
             instance_id=instance_id, metadata=args.metadata, labels=args.labels
         )
@@ -499,6 +657,9 @@ class RunnerManager:
             )
 
         except RunnerError:
+            if failed_platform_runners is not None:
+                failed_platform_runners.append(github_runner)
+                raise
             logger.warning("Deleting runner %s from platform after creation failed", instance_id)
             args.platform_provider.delete_runners([github_runner])
             raise
@@ -40,7 +40,7 @@ from github_runner_manager.reactive.types_ import ReactiveProcessConfig
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RunnerInfo:
     """Information on the runners.
 
@@ -3,13 +3,18 @@
 
 """Classes and function to extract the metrics from storage and issue runner metrics events."""
 
+import base64
+import binascii
 import io
 import json
 import logging
+import shlex
+import tarfile
 from dataclasses import dataclass
 from datetime import datetime
 from json import JSONDecodeError
-from typing import Optional, Type
+from pathlib import Path
+from typing import Optional, Sequence, Type
 
 import paramiko
 import paramiko.ssh_exception
@@ -36,9 +41,9 @@ logger = logging.getLogger(__name__)
 
 MAX_METRICS_FILE_SIZE = 1024
 
-
-class PullFileError(Exception):
-    """Represents an error while pulling a file from the runner instance."""
+_MISSING_METRICS_FILE_LOG_MSG = (
+    "Failed to pull metrics for %s: %s not found or invalid. Will not be able to issue all metrics"
+)
 
 
 def pull_runner_metrics(instance_id: InstanceID, ssh_conn: SSHConnection) -> "PulledMetrics":
@@ -54,90 +59,97 @@ def pull_runner_metrics(instance_id: InstanceID, ssh_conn: SSHConnection) -> "Pu
     logger.debug("Pulling metrics for %s", instance_id)
     pulled_metrics = PulledMetrics()
 
-    try:
-        pulled_metrics.runner_installed = ssh_pull_file(
-            ssh_conn=ssh_conn,
-            remote_path=str(RUNNER_INSTALLED_TS_FILE_NAME),
-            max_size=MAX_METRICS_FILE_SIZE,
-        )
-        pulled_metrics.pre_job_metrics = ssh_pull_file(
-            ssh_conn=ssh_conn,
-            remote_path=str(PRE_JOB_METRICS_FILE_NAME),
-            max_size=MAX_METRICS_FILE_SIZE,
-        )
-        pulled_metrics.post_job_metrics = ssh_pull_file(
-            ssh_conn=ssh_conn,
-            remote_path=str(POST_JOB_METRICS_FILE_NAME),
-            max_size=MAX_METRICS_FILE_SIZE,
-        )
-    except PullFileError as exc:
-        logger.warning(
-            "Failed to pull metrics for %s: %s . Will not be able to issue all metrics",
-            instance_id,
-            exc,
-        )
+    # All the metrics files are pulled in one round trip. A missing metrics file means the
+    # following ones are not expected to be valid either.
+    pulled_files = ssh_pull_files(
+        ssh_conn=ssh_conn,
+        remote_paths=(
+            RUNNER_INSTALLED_TS_FILE_NAME,
+            PRE_JOB_METRICS_FILE_NAME,
+            POST_JOB_METRICS_FILE_NAME,
+        ),
+        max_size=MAX_METRICS_FILE_SIZE,
+    )
+    if (runner_installed := pulled_files.get(str(RUNNER_INSTALLED_TS_FILE_NAME))) is None:
+        logger.warning(_MISSING_METRICS_FILE_LOG_MSG, instance_id, RUNNER_INSTALLED_TS_FILE_NAME)
+        return pulled_metrics
+    pulled_metrics.runner_installed = runner_installed
+    if (pre_job_metrics := pulled_files.get(str(PRE_JOB_METRICS_FILE_NAME))) is None:
+        logger.warning(_MISSING_METRICS_FILE_LOG_MSG, instance_id, PRE_JOB_METRICS_FILE_NAME)
+        return pulled_metrics
+    pulled_metrics.pre_job_metrics = pre_job_metrics
+    if (post_job_metrics := pulled_files.get(str(POST_JOB_METRICS_FILE_NAME))) is None:
+        logger.warning(_MISSING_METRICS_FILE_LOG_MSG, instance_id, POST_JOB_METRICS_FILE_NAME)
+        return pulled_metrics
+    pulled_metrics.post_job_metrics = post_job_metrics
     return pulled_metrics
 
 
-def ssh_pull_file(ssh_conn: SSHConnection, remote_path: str, max_size: int) -> str:
-    """Pull file from the runner instance.
+def ssh_pull_files(
+    ssh_conn: SSHConnection, remote_paths: Sequence[Path], max_size: int
+) -> dict[str, str]:
+    """Pull files from the runner instance with a single SSH command.
+
+    The files are archived with tar on the runner instance and streamed base64 encoded through
+    the command output, as the output is decoded as text by the SSH client. Files that do not
+    exist, are larger than max_size or can not be decoded are not returned.
 
     Args:
         ssh_conn: The SSH connection instance.
-        remote_path: The file path on the runner instance.
-        max_size: If the file is larger than this, it will not be pulled.
+        remote_paths: The file paths on the runner instance.
+        max_size: If a file is larger than this, it will not be pulled.
 
     Returns:
-        The content of the file as a string
+        The content of the pulled files as strings, keyed by their path.
 
     Raises:
-        PullFileError: Unable to pull the file from the runner instance.
         SSHError: Issue with SSH connection.
     """
+    # Each archive member takes a header block plus its content padded to the block size, and
+    # the archive ends with two empty blocks. Anything over that is an oversized file.
+    padded_max_size = (max_size + tarfile.BLOCKSIZE - 1) // tarfile.BLOCKSIZE * tarfile.BLOCKSIZE
+    output_limit = len(remote_paths) * (tarfile.BLOCKSIZE + padded_max_size)
+    output_limit += 2 * tarfile.BLOCKSIZE
+    paths = " ".join(shlex.quote(str(remote_path)) for remote_path in remote_paths)
     try:
-        result = ssh_conn.run(f"stat -c %s {remote_path}", warn=True, timeout=60, hide=True)
+        result = ssh_conn.run(
+            f"tar --ignore-failed-read --blocking-factor=1 -cPf - {paths} 2>/dev/null"
+            f" | head -c {output_limit} | base64 -w0",
+            warn=True,
+            timeout=60,
+            hide=True,
+        )
     except (
         TimeoutError,
         paramiko.ssh_exception.NoValidConnectionsError,
         paramiko.ssh_exception.SSHException,
     ) as exc:
         raise SSHError(f"Unable to SSH into {ssh_conn.host}") from exc
-    if not result.ok:
+
+    pulled_files: dict[str, str] = {}
+    try:
+        archive = base64.b64decode(result.stdout.strip(), validate=True)
+        with tarfile.open(fileobj=io.BytesIO(archive), mode="r|") as tar:
+            for member in tar:
+                if not member.isfile() or member.size > max_size:
+                    logger.warning(
+                        "Unable to pull %s of size %s on instance %s",
+                        member.name,
+                        member.size,
+                        ssh_conn.host,
+                    )
+                    continue
+                if (file_obj := tar.extractfile(member)) is not None:
+                    pulled_files[member.name] = file_obj.read().decode("utf-8")
+    except (binascii.Error, tarfile.TarError, UnicodeDecodeError) as exc:
         logger.warning(
-            (
-                "Unable to get file size of %s on instance %s, "
-                "exit code: %s, stdout: %s, stderr: %s"
-            ),
-            remote_path,
+            "Unable to read files pulled from instance %s, exit code: %s, stderr: %s, error: %s",
             ssh_conn.host,
             result.return_code,
-            result.stdout,
             result.stderr,
+            exc,
         )
-        raise PullFileError(f"Unable to get file size of {remote_path}")
-
-    stdout = result.stdout
-    try:
-        stdout.strip()
-        size = int(stdout)
-        if size > max_size:
-            raise PullFileError(f"File size of {remote_path} too large {size} > {max_size}")
-    except ValueError as exc:
-        raise PullFileError(f"Invalid file size for {remote_path}: stdout") from exc
-
-    try:
-        file_like_obj = FileLikeLimited(max_size)
-        ssh_conn.get(remote=remote_path, local=file_like_obj)
-        value = file_like_obj.getvalue().decode("utf-8")
-    except (
-        TimeoutError,
-        paramiko.ssh_exception.NoValidConnectionsError,
-        paramiko.ssh_exception.SSHException,
-    ) as exc:
-        raise SSHError(f"Unable to SSH into {ssh_conn.host}") from exc
-    except (OSError, UnicodeDecodeError, FileLimitError) as exc:
-        raise PullFileError(f"Error retrieving file {remote_path}. Error: {exc}") from exc
-    return value
+    return pulled_files
 
 
 @dataclass
@@ -471,39 +483,3 @@ def _create_runner_stop(
         job_duration=job_duration,
         job_conclusion=job_metrics.conclusion if job_metrics else None,
     )
-
-
-class FileLimitError(Exception):
-    """Error returned when a file is too large."""
-
-
-class FileLikeLimited(io.BytesIO):
-    """file-like object with a maximum possible size."""
-
-    def __init__(self, max_size: int):
-        """Create a new FileLikeLimited object.
-
-        Args:
-            max_size: Maximum allowed size for the file-like object.
-        """
-        self.max_size = max_size
-
-    # The type of b is tricky. In Python 3.12 it is a collections.abc.Buffer,
-    # and as so it does not have len (we use Python 3.10). For our purpose this works,
-    # as Fabric sends bytes. If it ever changes, we will catch it in the
-    # integration tests.
-    def write(self, b, /) -> int:  # type: ignore[no-untyped-def]
-        """Write to the internal buffer for the file-like object.
-
-        Args:
-            b: bytes to write.
-
-        Returns:
-            Number of bytes written.
-
-        Raises:
-            FileLimitError: Raised when what is written to the file is over the allowed size.
-        """
-        if len(self.getvalue()) + len(b) > self.max_size:
-            raise FileLimitError(f"Exceeded allowed max file size {self.max_size})")
-        return super().write(b)
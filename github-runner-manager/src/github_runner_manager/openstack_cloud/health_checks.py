@@ -25,6 +25,10 @@ INSTANCE_IN_BUILD_MODE_TIMEOUT_IN_HOURS = 1
 
 _HealthCheckResult = bool | None  # None indicates that the check can not determine health status
 
+_RUNNER_PROCESSES_CHECK_COMMAND = (
+    f"pgrep -x {RUNNER_WORKER_PROCESS} || pgrep -x {RUNNER_LISTENER_PROCESS}"
+)
+
 
 class _SSHError(Exception):
     """Error on SSH command execution."""
@@ -112,7 +116,7 @@ def check_active_runner(
     return True
 
 
-@retry(exception=SSHError, tries=3, delay=5, backoff=2, local_logger=logger)
+@retry(exception=SSHError, tries=3, delay=5, backoff=2, local_logger=logger, jitter=(0, 2))
 def _get_ssh_connection(
     openstack_cloud: OpenstackCloud, instance: OpenstackInstance
 ) -> SSHConnection:
@@ -258,14 +262,15 @@ def _run_health_check_runner_processes_running(
     Returns:
         If the run can be considered healthy depending on the existence of the processes.
     """
-    result = _execute_ssh_command(ssh_conn, "ps aux")
-    if not result.ok:
-        logger.warning("SSH run of `ps aux` failed on %s: %s", server_name, result.stderr)
-        return False
-    if RUNNER_WORKER_PROCESS not in result.stdout and RUNNER_LISTENER_PROCESS not in result.stdout:
+    # pgrep exits with 1 when no process matched, instead of transferring the process table.
+    result = _execute_ssh_command(ssh_conn, _RUNNER_PROCESSES_CHECK_COMMAND)
+    if result.ok:
+        return None
+    if result.return_code == 1:
         logger.warning("Runner process not found on %s", server_name)
-        return False
-    return None
+    else:
+        logger.warning("SSH run of `pgrep` failed on %s: %s", server_name, result.stderr)
+    return False
 
 
 def _execute_ssh_command(ssh_conn: SSHConnection, command: str) -> invoke.runners.Result:
@@ -6,11 +6,13 @@ import copy
 import functools
 import logging
 import shutil
+import time
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import reduce
 from pathlib import Path
+from threading import Lock
 from typing import Any, Callable, Iterable, Iterator, ParamSpec, TypeVar, cast
 
 import keystoneauth1.exceptions
@@ -37,6 +39,16 @@ logger = logging.getLogger(__name__)
 _SECURITY_GROUP_NAME = "github-runner-v1"
 
 _SSH_TIMEOUT = 30
+# Interval of the keepalive packets sent on idle cached SSH connections.
+_SSH_KEEPALIVE_INTERVAL = 30
+# Only the instance keyfile is used for authentication, so the lookup of the default keys and of
+# an SSH agent is skipped on connect.
+_SSH_CONNECT_KWARGS = {
+    "look_for_keys": False,
+    "allow_agent": False,
+    "banner_timeout": _SSH_TIMEOUT,
+    "auth_timeout": _SSH_TIMEOUT,
+}
 _TEST_STRING = "test_string"
 
 SecurityRuleDict = dict[str, Any]
@@ -63,6 +75,14 @@ DEFAULT_SECURITY_RULES: dict[str, SecurityRuleDict] = {
     },
 }
 
+# The list of instances is reused for this long, so the calls made while managing the runners in
+# the same reconcile step do not list the servers again.
+_INSTANCES_CACHE_TTL_SECONDS = 2
+
+# The ID of the ensured security group is reused for this long, so the runners created in the same
+# batch check the security group once, and the next batch checks it again.
+_SECURITY_GROUP_CACHE_TTL_SECONDS = 60
+
 # Keypairs younger than this value should not be deleted to avoid a race condition where
 # the openstack server is in construction but not yet returned by the API, and the keypair gets
 # deleted.
@@ -110,6 +130,45 @@ class OpenstackInstance:
         self.metadata = RunnerMetadata(**server.metadata) if server.metadata else RunnerMetadata()
 
 
+@dataclass(frozen=True)
+class _InstancesCache:
+    """A listing of the OpenStack instances.
+
+    Attributes:
+        timestamp: Monotonic time of the listing.
+        instances: The OpenStack instances.
+        by_name: The OpenStack instances indexed by instance name.
+    """
+
+    timestamp: float
+    instances: tuple[OpenstackInstance, ...]
+    by_name: dict[str, OpenstackInstance]
+
+    @classmethod
+    def build(cls, instances: tuple[OpenstackInstance, ...]) -> "_InstancesCache":
+        """Index a listing of the OpenStack instances.
+
+        Args:
+            instances: The OpenStack instances.
+
+        Returns:
+            The listing of the instances, timestamped now.
+        """
+        return cls(
+            timestamp=time.monotonic(),
+            instances=instances,
+            by_name={instance.instance_id.name: instance for instance in instances},
+        )
+
+    def is_fresh(self) -> bool:
+        """Whether the listing can still be reused.
+
+        Returns:
+            True if the listing is younger than the cache TTL.
+        """
+        return time.monotonic() - self.timestamp < _INSTANCES_CACHE_TTL_SECONDS
+
+
 P = ParamSpec("P")
 T = TypeVar("T")
 
@@ -164,7 +223,10 @@ def _get_openstack_connection(credentials: OpenStackCredentials) -> Iterator[Ope
     """
     # api documents that keystoneauth1.exceptions.MissingRequiredOptions can be raised but
     # I could not reproduce it. Therefore, no catch here for such exception.
+    # The credentials are passed explicitly, so the search and parsing of clouds.yaml files on
+    # every connection is skipped.
     with openstack.connect(
+        load_yaml_config=False,
         auth_url=credentials.auth_url,
         project_name=credentials.project_name,
         username=credentials.username,
@@ -206,6 +268,22 @@ class OpenstackCloud:
         self._system_user = system_user
         self._ssh_key_dir = Path(f"~{system_user}").expanduser() / ".ssh"
         self._proxy_command = proxy_command
+        # SSH connections reused across calls, keyed on instance name. Guarded by a lock as the
+        # runners are managed from several threads.
+        self._ssh_connections: dict[str, SSHConnection] = {}
+        self._ssh_connections_lock = Lock()
+        # Time and ID of the security groups ensured by this instance, keyed on the extra ingress
+        # ports. Runners are created in batches, so the security group is checked once per batch.
+        # Each set of ports has its own lock held while the security group is checked, so the
+        # OpenStack calls for a set of ports do not block the others.
+        self._security_group_ids: dict[tuple[int, ...], tuple[float, str]] = {}
+        self._security_group_port_locks: dict[tuple[int, ...], Lock] = {}
+        self._security_group_lock = Lock()
+        # Time and value of the last listing of the instances. The generation is increased on
+        # each change to the instances, so a listing started before a change is not cached.
+        self._instances_cache: _InstancesCache | None = None
+        self._instances_generation = 0
+        self._instances_lock = Lock()
 
     @_catch_openstack_errors
     # Pending to review the list of arguments
@@ -236,8 +314,11 @@ class OpenstackCloud:
         """
         logger.info("Creating openstack server with %s", instance_id)
 
-        with _get_openstack_connection(credentials=self._credentials) as conn:
-            security_group = OpenstackCloud._ensure_security_group(conn, ingress_tcp_ports)
+        with (
+            self._changing_instances(),
+            _get_openstack_connection(credentials=self._credentials) as conn,
+        ):
+            security_group_id = self._get_security_group_id(conn, ingress_tcp_ports)
             keypair = self._setup_keypair(conn, instance_id)
             meta = metadata.as_dict()
             meta["prefix"] = self.prefix
@@ -248,7 +329,7 @@ class OpenstackCloud:
                     key_name=keypair.name,
                     flavor=server_config.flavor,
                     network=server_config.network,
-                    security_groups=[security_group.id],
+                    security_groups=[security_group_id],
                     userdata=cloud_init,
                     auto_ip=False,
                     timeout=CREATE_SERVER_TIMEOUT,
@@ -265,6 +346,8 @@ class OpenstackCloud:
                 raise OpenStackError(f"Timeout creating openstack server {instance_id}") from err
             except openstack.exceptions.SDKException as err:
                 logger.exception("Failed to create openstack server %s", instance_id)
+                # The security group might have been removed, check it on the next creation.
+                self._forget_security_group_id(ingress_tcp_ports)
                 self._delete_keypair(conn, instance_id)
                 raise OpenStackError(f"Failed to create openstack server {instance_id}") from err
 
@@ -282,6 +365,13 @@ class OpenstackCloud:
         """
         logger.info("Getting openstack server with %s", instance_id)
 
+        # Instances missing from the listing might have been created since, so only the found
+        # ones are taken from it.
+        if (cache := self._get_fresh_instances_cache()) is not None and (
+            instance := cache.by_name.get(instance_id.name)
+        ) is not None:
+            return instance
+
         with _get_openstack_connection(credentials=self._credentials) as conn:
             server = OpenstackCloud._get_and_ensure_unique_server(conn, instance_id)
             if server is not None:
@@ -297,7 +387,10 @@ class OpenstackCloud:
         """
         logger.info("Deleting openstack server with %s", instance_id)
 
-        with _get_openstack_connection(credentials=self._credentials) as conn:
+        with (
+            self._changing_instances(),
+            _get_openstack_connection(credentials=self._credentials) as conn,
+        ):
             self._delete_instance(conn, instance_id)
 
     def _delete_instance(self, conn: OpenstackConnection, instance_id: InstanceID) -> None:
@@ -310,6 +403,7 @@ class OpenstackCloud:
             conn: The openstack connection to use.
             instance_id: The full name of the server.
         """
+        self._close_ssh_connection(instance_id.name)
         try:
             server = OpenstackCloud._get_and_ensure_unique_server(conn, instance_id)
             if server is not None:
@@ -325,6 +419,9 @@ class OpenstackCloud:
     def get_ssh_connection(self, instance: OpenstackInstance) -> SSHConnection:
         """Get SSH connection to an OpenStack instance.
 
+        The connection is cached and reused by later calls for the same instance while it stays
+        connected. The cached connection is closed when the instance is deleted.
+
         Args:
             instance: The OpenStack instance to connect to.
 
@@ -344,12 +441,15 @@ class OpenstackCloud:
         if not instance.addresses:
             raise SSHError(f"No addresses found for OpenStack server {instance.instance_id.name}")
 
+        if (cached_connection := self._get_cached_ssh_connection(instance)) is not None:
+            return cached_connection
+
         for ip in instance.addresses:
             try:
                 connection = SSHConnection(
                     host=ip,
                     user="ubuntu",
-                    connect_kwargs={"key_filename": str(key_path)},
+                    connect_kwargs={**_SSH_CONNECT_KWARGS, "key_filename": str(key_path)},
                     connect_timeout=_SSH_TIMEOUT,
                     gateway=self._proxy_command,
                 )
@@ -364,6 +464,7 @@ class OpenstackCloud:
                     )
                     continue
                 if _TEST_STRING in result.stdout:
+                    self._cache_ssh_connection(instance.instance_id.name, connection)
                     return connection
             except NoValidConnectionsError as exc:
                 logger.warning(
@@ -386,10 +487,121 @@ class OpenstackCloud:
             f"addresses: {instance.addresses}"
         )
 
+    def _get_cached_ssh_connection(self, instance: OpenstackInstance) -> SSHConnection | None:
+        """Get the cached SSH connection to an instance if it is still usable.
+
+        Args:
+            instance: The OpenStack instance to connect to.
+
+        Returns:
+            The cached SSH connection, or None if there is no usable cached connection.
+        """
+        with self._ssh_connections_lock:
+            connection = self._ssh_connections.get(instance.instance_id.name)
+            if connection is None:
+                return None
+            if connection.is_connected and connection.host in instance.addresses:
+                return connection
+            del self._ssh_connections[instance.instance_id.name]
+        logger.debug("Dropping stale SSH connection to %s", instance.instance_id.name)
+        connection.close()
+        return None
+
+    def _cache_ssh_connection(self, name: str, connection: SSHConnection) -> None:
+        """Cache a working SSH connection to an instance.
+
+        Args:
+            name: The name of the instance.
+            connection: The connected SSH connection.
+        """
+        # Keep the connection open between the calls.
+        if connection.transport is not None:
+            connection.transport.set_keepalive(_SSH_KEEPALIVE_INTERVAL)
+        with self._ssh_connections_lock:
+            previous = self._ssh_connections.get(name)
+            self._ssh_connections[name] = connection
+        if previous is not None and previous is not connection:
+            previous.close()
+
+    def _close_ssh_connection(self, name: str) -> None:
+        """Close and remove the cached SSH connection to an instance.
+
+        Args:
+            name: The name of the instance.
+        """
+        with self._ssh_connections_lock:
+            connection = self._ssh_connections.pop(name, None)
+        if connection is not None:
+            connection.close()
+
+    def _close_stale_ssh_connections(self, names: set[str]) -> None:
+        """Close and remove the cached SSH connections to instances that no longer exist.
+
+        Instances can be removed without going through this class, e.g., by another process or
+        as duplicates, leaving their cached connections open.
+
+        Args:
+            names: The names of the existing instances.
+        """
+        with self._ssh_connections_lock:
+            stale_names = self._ssh_connections.keys() - names
+            stale_connections = [self._ssh_connections.pop(name) for name in stale_names]
+        for connection in stale_connections:
+            connection.close()
+
     @_catch_openstack_errors
     def get_instances(self) -> tuple[OpenstackInstance, ...]:
         """Get all OpenStack instances.
 
+        The instances listed within the last seconds are reused, unless an instance was launched
+        or deleted since.
+
+        Returns:
+            The OpenStack instances.
+        """
+        with self._instances_lock:
+            generation = self._instances_generation
+        if (cache := self._get_fresh_instances_cache()) is not None:
+            logger.debug("Reusing the list of openstack servers managed by the charm")
+            return cache.instances
+
+        instances = self._list_instances()
+        with self._instances_lock:
+            if generation == self._instances_generation:
+                self._instances_cache = _InstancesCache.build(instances)
+        return instances
+
+    def _get_fresh_instances_cache(self) -> _InstancesCache | None:
+        """Get the cached listing of the instances if it can still be reused.
+
+        Returns:
+            The cached listing of the instances, or None.
+        """
+        with self._instances_lock:
+            cache = self._instances_cache
+        if cache is not None and cache.is_fresh():
+            return cache
+        return None
+
+    @contextmanager
+    def _changing_instances(self) -> Iterator[None]:
+        """Drop the cached list of instances once a change to the instances is done.
+
+        Listings overlapping with the change are not cached either.
+
+        Yields:
+            Nothing, the instances are changed within the context.
+        """
+        try:
+            yield
+        finally:
+            with self._instances_lock:
+                self._instances_generation += 1
+                self._instances_cache = None
+
+    def _list_instances(self) -> tuple[OpenstackInstance, ...]:
+        """List all OpenStack instances.
+
         Returns:
             The OpenStack instances.
         """
@@ -411,9 +623,10 @@ class OpenstackCloud:
 
     @_catch_openstack_errors
     def cleanup(self) -> None:
-        """Cleanup unused key files and openstack keypairs."""
+        """Cleanup unused key files, openstack keypairs and SSH connections."""
         with _get_openstack_connection(credentials=self._credentials) as conn:
             instances = self._get_openstack_instances(conn)
+            self._close_stale_ssh_connections({server.name for server in instances})
             exclude_keyfiles_set = {
                 self._get_key_path(InstanceID.build_from_name(self.prefix, server.name))
                 for server in instances
@@ -605,6 +818,43 @@ class OpenstackCloud:
         key_path = self._get_key_path(instance_id.name)
         key_path.unlink(missing_ok=True)
 
+    def _get_security_group_id(
+        self, conn: OpenstackConnection, ingress_tcp_ports: list[int] | None
+    ) -> str:
+        """Get the ID of the runner security group, ensuring it once per batch for a set of ports.
+
+        Args:
+            conn: The connection object to access OpenStack cloud.
+            ingress_tcp_ports: Ports to create an ingress rule for.
+
+        Returns:
+            The ID of the security group with the rules for runners.
+        """
+        ports_key = _get_ports_key(ingress_tcp_ports)
+        with self._security_group_lock:
+            port_lock = self._security_group_port_locks.setdefault(ports_key, Lock())
+        with port_lock:
+            with self._security_group_lock:
+                cached = self._security_group_ids.get(ports_key)
+            if (
+                cached is not None
+                and time.monotonic() - cached[0] < _SECURITY_GROUP_CACHE_TTL_SECONDS
+            ):
+                return cached[1]
+            security_group = OpenstackCloud._ensure_security_group(conn, ingress_tcp_ports)
+            with self._security_group_lock:
+                self._security_group_ids[ports_key] = (time.monotonic(), security_group.id)
+        return security_group.id
+
+    def _forget_security_group_id(self, ingress_tcp_ports: list[int] | None) -> None:
+        """Drop the cached security group ID for a set of ports.
+
+        Args:
+            ingress_tcp_ports: Ports of the ingress rules of the security group.
+        """
+        with self._security_group_lock:
+            self._security_group_ids.pop(_get_ports_key(ingress_tcp_ports), None)
+
     @staticmethod
     def _ensure_security_group(
         conn: OpenstackConnection, ingress_tcp_ports: list[int] | None
@@ -646,6 +896,18 @@ class OpenstackCloud:
         return security_group
 
 
+def _get_ports_key(ingress_tcp_ports: list[int] | None) -> tuple[int, ...]:
+    """Get a hashable key for a list of ingress ports.
+
+    Args:
+        ingress_tcp_ports: Ports to create an ingress rule for.
+
+    Returns:
+        The sorted unique ports.
+    """
+    return tuple(sorted(set(ingress_tcp_ports or ())))
+
+
 def get_missing_security_rules(
     security_group: OpenstackSecurityGroup, ingress_tcp_ports: list[int] | None
 ) -> dict[str, SecurityRuleDict]:
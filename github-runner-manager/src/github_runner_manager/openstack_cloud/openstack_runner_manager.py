@@ -3,9 +3,11 @@
 
 """Manager for self-hosted runner on OpenStack."""
 
+import functools
 import logging
 import secrets
 from dataclasses import dataclass
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from typing import Iterable, Sequence
 
@@ -50,12 +52,28 @@ _CONFIG_SCRIPT_PATH = Path("/home/ubuntu/actions-runner/config.sh")
 RUNNER_APPLICATION = Path("/home/ubuntu/actions-runner")
 PRE_JOB_SCRIPT = RUNNER_APPLICATION / "pre-job.sh"
 
+# String forms of the paths rendered in the cloud init of every runner.
+_PRE_JOB_SCRIPT_STR = str(PRE_JOB_SCRIPT)
+_METRICS_EXCHANGE_PATH_STR = str(METRICS_EXCHANGE_PATH)
+
 RUNNER_STARTUP_PROCESS = "/home/ubuntu/actions-runner/run.sh"
 
 OUTDATED_METRICS_STORAGE_IN_SECONDS = CREATE_SERVER_TIMEOUT + 30  # add a bit on top of the timeout
 
 HEALTH_CHECK_ERROR_LOG_MSG = "Health check could not be completed for %s"
 
+# Maximum number of runners deleted concurrently during cleanup.
+_MAX_CLEANUP_WORKERS = 10
+# Maximum number of runners health checked concurrently.
+_MAX_HEALTH_CHECK_WORKERS = 16
+
+# The templates are shipped with the package and do not change, so the environment is shared and
+# the compiled templates are cached without checking for updates.
+# We do not autoscape, the reason is that we are not generating html or xml
+_JINJA_ENV = jinja2.Environment(  # nosec
+    loader=jinja2.PackageLoader("github_runner_manager", "templates"), auto_reload=False
+)
+
 
 class _GithubRunnerRemoveError(Exception):
     """Represents an error while SSH into a runner and running the remove script."""
@@ -170,22 +188,20 @@ class OpenStackRunnerManager(CloudRunnerManager):
         Returns:
             Information on the runner instances.
         """
-        instances = self._openstack_cloud.get_instances()
-        runners = []
-        for instance in instances:
-            try:
-                healthy = health_checks.check_runner(
-                    openstack_cloud=self._openstack_cloud, instance=instance
-                )
-            except OpenstackHealthCheckError:
-                logger.exception(HEALTH_CHECK_ERROR_LOG_MSG, instance.instance_id.name)
-                healthy = None
-            runners.append(self._build_cloud_runner_instance(instance, healthy))
-        if states is None:
-            return tuple(runners)
-
-        state_set = set(states)
-        return tuple(runner for runner in runners if runner.state in state_set)
+        instances: Sequence[OpenstackInstance] = self._openstack_cloud.get_instances()
+        if states is not None:
+            # The state only depends on the server status, so the instances are filtered before
+            # running the health checks on them.
+            state_set = frozenset(states)
+            instances = [
+                instance
+                for instance in instances
+                if CloudRunnerState.from_openstack_server_status(instance.status) in state_set
+            ]
+        return tuple(
+            self._build_cloud_runner_instance(instance, healthy)
+            for instance, healthy in zip(instances, self._check_runners_health(instances))
+        )
 
     def _build_cloud_runner_instance(
         self, instance: OpenstackInstance, healthy: bool | None = None
@@ -273,17 +289,20 @@ class OpenStackRunnerManager(CloudRunnerManager):
         logger.debug("Getting runner healths for cleanup.")
         runners = self._get_runners_health()
 
-        healthy_runner_names = {runner.instance_id for runner in runners.healthy}
-        unhealthy_runner_names = {runner.instance_id for runner in runners.unhealthy}
-        unknown_runner_names = {runner.instance_id for runner in runners.unknown}
-        logger.debug("Healthy runners: %s", healthy_runner_names)
-        logger.debug("Unhealthy runners: %s", unhealthy_runner_names)
-        logger.debug("Unknown health runners: %s", unknown_runner_names)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Healthy runners: %s", {runner.instance_id for runner in runners.healthy})
+            logger.debug(
+                "Unhealthy runners: %s", {runner.instance_id for runner in runners.unhealthy}
+            )
+            logger.debug(
+                "Unknown health runners: %s", {runner.instance_id for runner in runners.unknown}
+            )
 
         logger.debug("Deleting unhealthy runners.")
         extracted_runner_metrics = []
-        for runner in runners.unhealthy:
-            pulled_metrics = self._delete_runner(runner, remove_token)
+        for runner, pulled_metrics in zip(
+            runners.unhealthy, self._delete_runners(runners.unhealthy, remove_token)
+        ):
             cloud_runner = self._build_cloud_runner_instance(runner)
             runner_metric = pulled_metrics.to_runner_metrics(cloud_runner, runner.created_at)
             if not runner_metric:
@@ -297,6 +316,27 @@ class OpenStackRunnerManager(CloudRunnerManager):
         logger.debug("Extracting metrics.")
         return extracted_runner_metrics
 
+    def _delete_runners(
+        self, instances: Sequence[OpenstackInstance], remove_token: str
+    ) -> list[runner_metrics.PulledMetrics]:
+        """Delete self-hosted runners by openstack instances in parallel.
+
+        Each deletion is independent and bound by the SSH and OpenStack API round trips, so the
+        deletions are run in a thread pool.
+
+        Args:
+            instances: The OpenStack instances.
+            remove_token: The GitHub remove token.
+
+        Returns:
+            The metrics pulled from each instance, in the order of the instances.
+        """
+        if not instances:
+            return []
+        delete_runner = functools.partial(self._delete_runner, remove_token=remove_token)
+        with ThreadPool(processes=min(len(instances), _MAX_CLEANUP_WORKERS)) as pool:
+            return pool.map(delete_runner, instances)
+
     def _delete_runner(
         self, instance: OpenstackInstance, remove_token: str
     ) -> runner_metrics.PulledMetrics:
@@ -347,21 +387,52 @@ class OpenStackRunnerManager(CloudRunnerManager):
         runner_list = self._openstack_cloud.get_instances()
 
         healthy, unhealthy, unknown = [], [], []
-        for runner in runner_list:
-            try:
-                if health_checks.check_runner(
-                    openstack_cloud=self._openstack_cloud, instance=runner
-                ):
-                    healthy.append(runner)
-                else:
-                    unhealthy.append(runner)
-            except OpenstackHealthCheckError:
-                logger.exception(HEALTH_CHECK_ERROR_LOG_MSG, runner.instance_id)
+        for runner, runner_healthy in zip(runner_list, self._check_runners_health(runner_list)):
+            if runner_healthy is None:
                 unknown.append(runner)
+            elif runner_healthy:
+                healthy.append(runner)
+            else:
+                unhealthy.append(runner)
         return _RunnerHealth(
             healthy=tuple(healthy), unhealthy=tuple(unhealthy), unknown=tuple(unknown)
         )
 
+    def _check_runners_health(self, instances: Sequence[OpenstackInstance]) -> list[bool | None]:
+        """Run the health check on the runner instances in parallel.
+
+        The health checks are independent and bound by the SSH round trips, so they are run in a
+        thread pool.
+
+        Args:
+            instances: The OpenStack instances to check.
+
+        Returns:
+            Whether each runner is healthy, or None if its health could not be determined, in the
+            order of the instances.
+        """
+        if not instances:
+            return []
+        with ThreadPool(processes=min(len(instances), _MAX_HEALTH_CHECK_WORKERS)) as pool:
+            return pool.map(self._check_runner_health, instances)
+
+    def _check_runner_health(self, instance: OpenstackInstance) -> bool | None:
+        """Run the health check on a runner instance.
+
+        Args:
+            instance: The OpenStack instance to check.
+
+        Returns:
+            Whether the runner is healthy, or None if its health could not be determined.
+        """
+        try:
+            return health_checks.check_runner(
+                openstack_cloud=self._openstack_cloud, instance=instance
+            )
+        except OpenstackHealthCheckError:
+            logger.exception(HEALTH_CHECK_ERROR_LOG_MSG, instance.instance_id.name)
+            return None
+
     def _generate_cloud_init(self, runner_context: RunnerContext) -> str:
         """Generate cloud init userdata.
 
@@ -373,11 +444,6 @@ class OpenStackRunnerManager(CloudRunnerManager):
         Returns:
             The cloud init userdata for openstack instance.
         """
-        # We do not autoscape, the reason is that we are not generating html or xml
-        jinja = jinja2.Environment(  # nosec
-            loader=jinja2.PackageLoader("github_runner_manager", "templates")
-        )
-
         service_config = self._config.service_config
         runner_http_proxy = (
             service_config.runner_proxy_config.proxy_address
@@ -389,18 +455,18 @@ class OpenStackRunnerManager(CloudRunnerManager):
             if service_config.ssh_debug_connections
             else None
         )
-        env_contents = jinja.get_template("env.j2").render(
-            pre_job_script=str(PRE_JOB_SCRIPT),
+        env_contents = _JINJA_ENV.get_template("env.j2").render(
+            pre_job_script=_PRE_JOB_SCRIPT_STR,
             dockerhub_mirror=service_config.dockerhub_mirror or "",
             ssh_debug_info=ssh_debug_info,
             tmate_server_proxy=runner_http_proxy,
         )
         pre_job_contents_dict = {
             "issue_metrics": True,
-            "metrics_exchange_path": str(METRICS_EXCHANGE_PATH),
+            "metrics_exchange_path": _METRICS_EXCHANGE_PATH_STR,
             "do_repo_policy_check": False,
         }
-        repo_policy = self._get_repo_policy_compliance_client()
+        repo_policy = self._repo_policy_compliance_client
         if repo_policy is not None:
             pre_job_contents_dict.update(
                 {
@@ -410,25 +476,27 @@ class OpenStackRunnerManager(CloudRunnerManager):
                 }
             )
 
-        pre_job_contents = jinja.get_template("pre-job.j2").render(pre_job_contents_dict)
+        pre_job_contents = _JINJA_ENV.get_template("pre-job.j2").render(pre_job_contents_dict)
 
-        aproxy_address = (
-            service_config.runner_proxy_config.proxy_address if service_config.use_aproxy else None
-        )
-        return jinja.get_template("openstack-userdata.sh.j2").render(
+        # aproxy requires the runner proxy config, so its address is the one computed above.
+        aproxy_address = runner_http_proxy if service_config.use_aproxy else None
+        return _JINJA_ENV.get_template("openstack-userdata.sh.j2").render(
             run_script=runner_context.shell_run_script,
             env_contents=env_contents,
             pre_job_contents=pre_job_contents,
-            metrics_exchange_path=str(METRICS_EXCHANGE_PATH),
+            metrics_exchange_path=_METRICS_EXCHANGE_PATH_STR,
             aproxy_address=aproxy_address,
             dockerhub_mirror=service_config.dockerhub_mirror,
             ssh_debug_info=ssh_debug_info,
             runner_proxy_config=service_config.runner_proxy_config,
         )
 
-    def _get_repo_policy_compliance_client(self) -> RepoPolicyComplianceClient | None:
+    @functools.cached_property
+    def _repo_policy_compliance_client(self) -> RepoPolicyComplianceClient | None:
         """Get repo policy compliance client.
 
+        The client is built once, so its HTTP session is reused across the runners created.
+
         Returns:
             The repo policy compliance client.
         """
@@ -439,7 +507,7 @@ class OpenStackRunnerManager(CloudRunnerManager):
             )
         return None
 
-    @retry(tries=3, delay=5, backoff=2, local_logger=logger)
+    @retry(tries=3, delay=5, backoff=2, local_logger=logger, jitter=(0, 2))
     def _check_state_and_flush(self, instance: OpenstackInstance, busy: bool) -> None:
         """Kill runner process depending on idle or busy.
 
@@ -4,6 +4,7 @@
 """Base classes and APIs for platform providers."""
 
 import abc
+import functools
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum, auto
@@ -150,14 +151,30 @@ class PlatformRunnerState(str, Enum):
         Args:
             runner: Information on the self-hosted runner.
 
+        Returns:
+            The state of runner.
+        """
+        return PlatformRunnerState.from_status(runner.status, runner.busy)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def from_status(status: GitHubRunnerStatus, busy: bool) -> "PlatformRunnerState":
+        """Construct the object from the status and busy flag of a runner.
+
+        The combinations of status and busy flag are few, so the result is cached.
+
+        Args:
+            status: The status of the self-hosted runner.
+            busy: Whether the self-hosted runner is busy.
+
         Returns:
             The state of runner.
         """
         state = PlatformRunnerState.OFFLINE
         # A runner that is busy and offline is possible.
-        if runner.busy:
+        if busy:
             state = PlatformRunnerState.BUSY
-        if runner.status == GitHubRunnerStatus.ONLINE and not runner.busy:
+        if status == GitHubRunnerStatus.ONLINE and not busy:
             state = PlatformRunnerState.IDLE
         return state
 
@@ -6,6 +6,7 @@
 import functools
 import logging
 import os
+import random
 import subprocess  # nosec B404
 import time
 from typing import Any, Callable, Optional, Sequence, Type, TypeVar
@@ -29,6 +30,7 @@ def retry(  # pylint: disable=too-many-arguments, too-many-positional-arguments
     max_delay: Optional[float] = None,
     backoff: float = 1,
     local_logger: logging.Logger = logger,
+    jitter: Optional[tuple[float, float]] = None,
 ) -> Callable[[Callable[ParamT, ReturnT]], Callable[ParamT, ReturnT]]:
     """Parameterize the decorator for adding retry to functions.
 
@@ -39,6 +41,8 @@ def retry(  # pylint: disable=too-many-arguments, too-many-positional-arguments
         max_delay: Max time in seconds to wait between retry.
         backoff: Factor to increase the delay by each retry.
         local_logger: Logger for logging.
+        jitter: Range of random time in seconds added to each wait between retry. This avoids
+            functions failing at the same time, e.g., in a thread pool, from retrying in lockstep.
 
     Returns:
         The function decorator for retry.
@@ -84,18 +88,14 @@ def retry(  # pylint: disable=too-many-arguments, too-many-positional-arguments
                             local_logger.exception("Retry limit of %s exceed: %s", tries, err)
                         raise
 
+                    wait = _add_jitter(current_delay, jitter)
                     if local_logger is not None:
-                        local_logger.warning(
-                            "Retrying error in %s seconds: %s", current_delay, err
-                        )
+                        local_logger.warning("Retrying error in %s seconds: %s", wait, err)
                         local_logger.debug("Error to be retried:", stack_info=True)
 
-                    time.sleep(current_delay)
+                    time.sleep(wait)
 
-                    current_delay *= backoff
-
-                    if max_delay is not None:
-                        current_delay = min(current_delay, max_delay)
+                    current_delay = _next_delay(current_delay, backoff, max_delay)
 
             raise RuntimeError("Unreachable code of retry logic.")
 
@@ -104,6 +104,39 @@ def retry(  # pylint: disable=too-many-arguments, too-many-positional-arguments
     return retry_decorator
 
 
+def _add_jitter(delay: float, jitter: Optional[tuple[float, float]]) -> float:
+    """Add a random jitter to the delay between retry.
+
+    Args:
+        delay: Time in seconds to wait between retry.
+        jitter: Range of random time in seconds to add to the delay.
+
+    Returns:
+        The time in seconds to wait before the next retry.
+    """
+    if jitter is None:
+        return delay
+    # The jitter is not used for security purposes.
+    return delay + random.uniform(*jitter)  # nosec B311
+
+
+def _next_delay(delay: float, backoff: float, max_delay: Optional[float]) -> float:
+    """Compute the delay between retry for the next attempt.
+
+    Args:
+        delay: Time in seconds waited between retry for the current attempt.
+        backoff: Factor to increase the delay by each retry.
+        max_delay: Max time in seconds to wait between retry.
+
+    Returns:
+        The time in seconds to wait between retry for the next attempt.
+    """
+    delay *= backoff
+    if max_delay is not None:
+        delay = min(delay, max_delay)
+    return delay
+
+
 def secure_run_subprocess(
     cmd: Sequence[str], hide_cmd: bool = False, **kwargs: dict[str, Any]
 ) -> subprocess.CompletedProcess[bytes]:
@@ -5,7 +5,11 @@
 
 import pytest
 
-from github_runner_manager.manager.models import InstanceID, InstanceIDInvalidError
+from github_runner_manager.manager.models import (
+    INSTANCE_SUFFIX_LENGTH,
+    InstanceID,
+    InstanceIDInvalidError,
+)
 
 
 def test_new_instance_id():
@@ -25,6 +29,33 @@ def test_new_instance_id():
     assert instance_id.name.startswith(prefix)
 
 
+@pytest.mark.parametrize(
+    "reactive",
+    [
+        pytest.param(True, id="reactive job name"),
+        pytest.param(False, id="non reactive job name"),
+    ],
+)
+def test_build_many_instance_ids(reactive):
+    """
+    arrange: Having an Application prefix.
+    act: Create several new InstanceIDs at once.
+    assert: The instance IDs have the prefix, the reactive flag and distinct suffixes
+       of the expected length.
+    """
+    prefix = "theprefix"
+
+    instance_ids = InstanceID.build_many(prefix, 5, reactive)
+
+    assert len(instance_ids) == 5
+    assert len({instance_id.suffix for instance_id in instance_ids}) == 5
+    for instance_id in instance_ids:
+        assert instance_id.prefix == prefix
+        assert instance_id.reactive == reactive
+        assert len(instance_id.suffix) == INSTANCE_SUFFIX_LENGTH
+        assert InstanceID.build_from_name(prefix, instance_id.name) == instance_id
+
+
 @pytest.mark.parametrize(
     "reactive",
     [
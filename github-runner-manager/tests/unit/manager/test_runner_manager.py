@@ -7,7 +7,7 @@ from unittest.mock import ANY, MagicMock
 
 import pytest
 
-from github_runner_manager.errors import RunnerCreateError
+from github_runner_manager.errors import RunnerCreateError, RunnerError
 from github_runner_manager.manager import runner_manager as runner_manager_module
 from github_runner_manager.manager.cloud_runner_manager import (
     CloudRunnerInstance,
@@ -17,10 +17,45 @@ from github_runner_manager.manager.cloud_runner_manager import (
 )
 from github_runner_manager.manager.models import InstanceID, RunnerContext, RunnerMetadata
 from github_runner_manager.manager.runner_manager import RunnerManager
-from github_runner_manager.platform.platform_provider import PlatformProvider, PlatformRunnerHealth
+from github_runner_manager.platform.platform_provider import (
+    PlatformProvider,
+    PlatformRunnerHealth,
+    PlatformRunnerState,
+)
 from github_runner_manager.types_.github import GitHubRunnerStatus, SelfHostedRunner
 
 
+@pytest.fixture(name="runner_manager")
+def runner_manager_fixture() -> tuple[RunnerManager, MagicMock, MagicMock]:
+    """Create a RunnerManager with mocked cloud runner manager and platform provider."""
+    cloud_runner_manager = MagicMock(spec=CloudRunnerManager)
+    cloud_runner_manager.name_prefix = "unit-0"
+    cloud_runner_manager.get_runners.return_value = ()
+    platform_provider = MagicMock(spec=PlatformProvider)
+    platform_provider.get_runners.return_value = []
+    platform_provider.get_removal_token.return_value = "removaltoken"
+    runner_manager = RunnerManager(
+        "managername",
+        platform_provider=platform_provider,
+        cloud_runner_manager=cloud_runner_manager,
+        labels=["label1", "label2"],
+    )
+    return runner_manager, cloud_runner_manager, platform_provider
+
+
+def _cloud_runner(
+    instance_id: InstanceID, state: CloudRunnerState = CloudRunnerState.ACTIVE
+) -> CloudRunnerInstance:
+    """Build a healthy cloud runner instance."""
+    return CloudRunnerInstance(
+        name=instance_id.name,
+        instance_id=instance_id,
+        metadata=RunnerMetadata(),
+        health=HealthState.HEALTHY,
+        state=state,
+    )
+
+
 @pytest.mark.parametrize(
     "cloud_state,health,reactive,removal_called",
     [
@@ -137,7 +172,7 @@ def test_cleanup_removes_offline_expected_runners(
     if removal_called:
         github_provider.delete_runners.assert_called_with([github_runner])
     else:
-        github_provider.delete_runners.assert_called_with([])
+        github_provider.delete_runners.assert_not_called()
 
 
 def test_failed_runner_in_openstack_cleans_github(monkeypatch: pytest.MonkeyPatch):
@@ -320,3 +355,234 @@ def test_create_runner_failed_waiting(monkeypatch: pytest.MonkeyPatch):
     assert platform_provider.get_runner_health.call_count == 2
     platform_provider.get_runner_health.assert_called_with(metadata=ANY, instance_id=ANY)
     platform_provider.delete_runners.assert_called_once_with([ANY])
+
+
+def test_create_runners_spawns_in_thread_pool(
+    monkeypatch: pytest.MonkeyPatch, runner_manager: tuple[RunnerManager, MagicMock, MagicMock]
+):
+    """
+    arrange: Given a cloud runner manager and a platform provider reporting online runners.
+    act: Call runner_manager.create_runners with more than one runner.
+    assert: All the runners are created, sharing the same managers.
+    """
+    monkeypatch.setattr(runner_manager_module, "RUNNER_CREATION_WAITING_TIMES", (0,))
+    manager, cloud_runner_manager, platform_provider = runner_manager
+    platform_provider.get_runner_context.return_value = (MagicMock(), MagicMock())
+    platform_provider.get_runner_health.return_value = PlatformRunnerHealth(
+        instance_id=MagicMock(), metadata=MagicMock(), online=True, busy=False, deletable=False
+    )
+
+    instance_ids = manager.create_runners(3, RunnerMetadata(), False)
+
+    assert len(instance_ids) == 3
+    assert len(set(instance_ids)) == 3
+    assert cloud_runner_manager.create_runner.call_count == 3
+
+
+def test_delete_runners_deletes_in_parallel(
+    runner_manager: tuple[RunnerManager, MagicMock, MagicMock],
+):
+    """
+    arrange: Given a cloud runner manager with several runners.
+    act: Call runner_manager.delete_runners for some of the runners.
+    assert: Each of the runners to delete is deleted in the cloud with the same removal token.
+    """
+    manager, cloud_runner_manager, _ = runner_manager
+    instance_ids = [InstanceID.build("unit-0") for _ in range(3)]
+    cloud_runner_manager.get_runners.return_value = tuple(
+        _cloud_runner(instance_id) for instance_id in instance_ids
+    )
+    cloud_runner_manager.delete_runner.return_value = None
+
+    assert manager.delete_runners(2) == {}
+
+    assert cloud_runner_manager.delete_runner.call_count == 2
+    deleted = {
+        call.kwargs["instance_id"] for call in cloud_runner_manager.delete_runner.call_args_list
+    }
+    assert deleted == set(instance_ids[:2])
+    cloud_runner_manager.delete_runner.assert_called_with(
+        instance_id=ANY, remove_token="removaltoken"
+    )
+
+
+def test_removal_token_is_cached(runner_manager: tuple[RunnerManager, MagicMock, MagicMock]):
+    """
+    arrange: Given a runner manager without runners.
+    act: Call cleanup and flush_runners.
+    assert: The removal token is requested to the platform only once.
+    """
+    manager, cloud_runner_manager, platform_provider = runner_manager
+    cloud_runner_manager.cleanup.return_value = iter(())
+    cloud_runner_manager.flush_runners.return_value = iter(())
+
+    manager.cleanup()
+    manager.flush_runners()
+
+    platform_provider.get_removal_token.assert_called_once()
+    cloud_runner_manager.cleanup.assert_called_once_with("removaltoken")
+    cloud_runner_manager.flush_runners.assert_called_once_with("removaltoken", False)
+
+
+def test_get_runners_matches_and_filters_runners(
+    runner_manager: tuple[RunnerManager, MagicMock, MagicMock],
+):
+    """
+    arrange: Given cloud runners in different states, some of them registered on the platform.
+    act: Call runner_manager.get_runners with and without filters and limit.
+    assert: Only the cloud runners matching the filters are returned, up to the limit.
+    """
+    manager, cloud_runner_manager, platform_provider = runner_manager
+    active_ids = [InstanceID.build("unit-0") for _ in range(2)]
+    created_id = InstanceID.build("unit-0")
+    cloud_runner_manager.get_runners.return_value = (
+        _cloud_runner(active_ids[0]),
+        _cloud_runner(active_ids[1]),
+        _cloud_runner(created_id, CloudRunnerState.CREATED),
+    )
+    platform_provider.get_runners.return_value = [
+        SelfHostedRunner(
+            id=1,
+            labels=[],
+            status=GitHubRunnerStatus.ONLINE,
+            busy=False,
+            instance_id=active_ids[0],
+            metadata=RunnerMetadata(platform_name="github", runner_id="1"),
+        ),
+        SelfHostedRunner(
+            id=2,
+            labels=[],
+            status=GitHubRunnerStatus.OFFLINE,
+            busy=False,
+            instance_id=InstanceID.build("unit-0"),
+            metadata=RunnerMetadata(platform_name="github", runner_id="2"),
+        ),
+    ]
+
+    all_runners = manager.get_runners()
+    active_runners = manager.get_runners(cloud_states=[CloudRunnerState.ACTIVE])
+    idle_runners = manager.get_runners(github_states=[PlatformRunnerState.IDLE])
+    limited_runners = manager.get_runners(limit=1)
+
+    assert [runner.instance_id for runner in all_runners] == [*active_ids, created_id]
+    assert all_runners[0].github_state == PlatformRunnerState.IDLE
+    assert all_runners[1].github_state is None
+    assert [runner.instance_id for runner in active_runners] == active_ids
+    assert [runner.instance_id for runner in idle_runners] == [active_ids[0]]
+    assert [runner.instance_id for runner in limited_runners] == [active_ids[0]]
+
+
+def test_create_runners_collects_failures(
+    monkeypatch: pytest.MonkeyPatch, runner_manager: tuple[RunnerManager, MagicMock, MagicMock]
+):
+    """
+    arrange: Given a cloud runner manager failing to create one of the runners.
+    act: Call runner_manager.create_runners with several runners.
+    assert: The failure is not raised and only the runners created are returned.
+    """
+    monkeypatch.setattr(runner_manager_module, "RUNNER_CREATION_WAITING_TIMES", (0,))
+    manager, cloud_runner_manager, platform_provider = runner_manager
+    cloud_runner_manager.create_runner.side_effect = [
+        MagicMock(),
+        RunnerCreateError(""),
+        MagicMock(),
+    ]
+    platform_provider.get_runner_context.return_value = (MagicMock(), MagicMock())
+    platform_provider.get_runner_health.return_value = PlatformRunnerHealth(
+        instance_id=MagicMock(), metadata=MagicMock(), online=True, busy=False, deletable=False
+    )
+
+    instance_ids = manager.create_runners(3, RunnerMetadata(), False)
+
+    assert len(instance_ids) == 2
+    # The platform runners of the failed creations are deleted in one request.
+    platform_provider.delete_runners.assert_called_once_with([ANY])
+
+
+def test_cleanup_issues_metrics_with_job_metrics(
+    monkeypatch: pytest.MonkeyPatch, runner_manager: tuple[RunnerManager, MagicMock, MagicMock]
+):
+    """
+    arrange: Given a cloud runner manager returning metrics for several deleted runners.
+    act: Call runner_manager.cleanup.
+    assert: The events of each runner are issued with the job metrics of that runner.
+    """
+    extracted_metrics = [MagicMock(), MagicMock(), MagicMock()]
+    extracted_metrics[2].pre_job = None
+    job_mock = MagicMock(side_effect=lambda runner, **_: f"job-{runner}")
+    monkeypatch.setattr(runner_manager_module.github_metrics, "job", job_mock)
+    issue_events_mock = MagicMock(return_value={runner_manager_module.metric_events.RunnerStop})
+    monkeypatch.setattr(runner_manager_module.runner_metrics, "issue_events", issue_events_mock)
+    manager, cloud_runner_manager, _ = runner_manager
+    cloud_runner_manager.cleanup.return_value = iter(extracted_metrics)
+
+    stats = manager.cleanup()
+
+    assert stats == {runner_manager_module.metric_events.RunnerStop: 3}
+    assert job_mock.call_count == 2
+    issued = [
+        (call.kwargs["runner_metrics"], call.kwargs["job_metrics"])
+        for call in issue_events_mock.call_args_list
+    ]
+    assert issued == [
+        (extracted_metrics[0], f"job-{extracted_metrics[0].instance_id}"),
+        (extracted_metrics[1], f"job-{extracted_metrics[1].instance_id}"),
+        (extracted_metrics[2], None),
+    ]
+
+
+def test_create_runners_with_zero_runners(
+    runner_manager: tuple[RunnerManager, MagicMock, MagicMock],
+):
+    """
+    arrange: Given a runner manager.
+    act: Call runner_manager.create_runners with zero runners.
+    assert: No runner is created.
+    """
+    manager, cloud_runner_manager, platform_provider = runner_manager
+
+    assert manager.create_runners(0, RunnerMetadata()) == ()
+    assert RunnerManager._spawn_runners([]) == ()
+
+    cloud_runner_manager.create_runner.assert_not_called()
+    platform_provider.get_runner_context.assert_not_called()
+
+
+def test_delete_runners_failure_drops_cached_removal_token(
+    runner_manager: tuple[RunnerManager, MagicMock, MagicMock],
+):
+    """
+    arrange: Given a cloud runner manager failing to delete a runner.
+    act: Call runner_manager.delete_runners twice.
+    assert: The error is raised and a new removal token is requested after the failure.
+    """
+    manager, cloud_runner_manager, platform_provider = runner_manager
+    cloud_runner_manager.get_runners.return_value = (_cloud_runner(InstanceID.build("unit-0")),)
+    cloud_runner_manager.delete_runner.side_effect = RunnerError("")
+
+    for _ in range(2):
+        with pytest.raises(RunnerError):
+            manager.delete_runners(1)
+
+    assert platform_provider.get_removal_token.call_count == 2
+
+
+def test_cleanup_failure_drops_cached_removal_token(
+    runner_manager: tuple[RunnerManager, MagicMock, MagicMock],
+):
+    """
+    arrange: Given a cloud runner manager failing to cleanup.
+    act: Call runner_manager.cleanup, then runner_manager.flush_runners.
+    assert: The error is raised and a new removal token is requested after the failure.
+    """
+    manager, cloud_runner_manager, platform_provider = runner_manager
+    cloud_runner_manager.cleanup.side_effect = RunnerError("")
+    cloud_runner_manager.flush_runners.return_value = iter(())
+    platform_provider.get_removal_token.side_effect = ["removaltoken", "newremovaltoken"]
+
+    with pytest.raises(RunnerError):
+        manager.cleanup()
+    manager.flush_runners()
+
+    assert platform_provider.get_removal_token.call_count == 2
+    cloud_runner_manager.flush_runners.assert_called_once_with("newremovaltoken", False)
@@ -1,6 +1,9 @@
 # Copyright 2025 Canonical Ltd.
 #  See LICENSE file for licensing details.
+import base64
+import io
 import secrets
+import tarfile
 from pathlib import Path
 from typing import Optional
 from unittest.mock import MagicMock, call
@@ -21,7 +24,7 @@ from github_runner_manager.metrics import events as metric_events
 from github_runner_manager.metrics import runner as runner_metrics
 from github_runner_manager.metrics import type as metrics_type
 from github_runner_manager.metrics.events import RunnerInstalled, RunnerStart, RunnerStop
-from github_runner_manager.metrics.runner import PullFileError, ssh_pull_file
+from github_runner_manager.metrics.runner import ssh_pull_files
 from github_runner_manager.types_.github import JobConclusion
 
 
@@ -332,99 +335,72 @@ def test_issue_events_post_job_but_no_pre_job(
     assert issued_metrics == {metric_events.RunnerInstalled}
 
 
-def test_ssh_pull_file():
+def _tar_stream(files: dict[str, bytes]) -> str:
+    """Build a tar archive with the given files, as output by the SSH command."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, content in files.items():
+            tar_info = tarfile.TarInfo(name=name)
+            tar_info.size = len(content)
+            tar.addfile(tar_info, io.BytesIO(content))
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def test_ssh_pull_files():
     """
-    arrange: Mock an ssh connection for run and get methods.
-       The run expects a stat command that returns a number (file size) and the
-       get sends a file through a file-like object.
-    act: Call ssh_pull_file.
-    assert: The content sent in the mocked ssh get is the same as the one returned by
-       ssh_pull_file.
+    arrange: Mock an ssh connection run method to output a tar archive with the files.
+    act: Call ssh_pull_files.
+    assert: The content of the files in the archive is returned in a single SSH command.
     """
-    remote_path = "/var/whatever"
-    max_size = 100
+    remote_paths = (Path("/var/first"), Path("/var/second"))
     ssh_conn = MagicMock(spec=SSHConnection)
 
     def _ssh_run(command, **kwargs) -> Optional[Result]:
-        """Expects a stat command for the file and returns a file size."""
-        assert "stat" in command
-        assert remote_path in command
-        file_size = 10
-        return Result(stdout=str(file_size))
+        """Expects a tar command for the files and returns the archive."""
+        assert "tar" in command
+        assert "base64" in command
+        assert all(str(remote_path) in command for remote_path in remote_paths)
+        return Result(
+            stdout=_tar_stream(
+                {"/var/first": b"first", "/var/second": '{"repository": "dépôt ✓"}'.encode()}
+            )
+        )
 
     ssh_conn.run.side_effect = _ssh_run
 
-    def _ssh_get(remote, local) -> None:
-        """Mocks get in ssh to write to a file-like object."""
-        assert remote_path in remote
-        local.write(b"content from")
-        local.write(b" the file")
-        return None
+    response = ssh_pull_files(ssh_conn, remote_paths, 100)
 
-    ssh_conn.get.side_effect = _ssh_get
+    assert response == {"/var/first": "first", "/var/second": '{"repository": "dépôt ✓"}'}
+    ssh_conn.run.assert_called_once()
 
-    response = ssh_pull_file(ssh_conn, remote_path, max_size)
 
-    assert response == "content from the file"
-
-
-def test_ssh_pull_file_invalid_size_real():
+def test_ssh_pull_files_skips_invalid_files():
     """
-    arrange: Mock an ssh connection for run and get methods.
-       The run expects a stat command that returns a number (file size) and the
-       get sends a file through a file-like object.
-    act: Call ssh_pull_file with a limit size smaller than what will be written
-       to the file-like object.
-    assert: A PullFileError is raised.
+    arrange: Mock an ssh connection run method to output a tar archive with a file larger
+       than the maximum size, and a missing file.
+    act: Call ssh_pull_files.
+    assert: Only the valid file is returned.
     """
-    remote_path = "/var/whatever"
-    max_size = 10
+    remote_paths = (Path("/var/large"), Path("/var/missing"), Path("/var/small"))
     ssh_conn = MagicMock(spec=SSHConnection)
+    ssh_conn.run.return_value = Result(
+        stdout=_tar_stream({"/var/large": b"more than ten bytes", "/var/small": b"small"})
+    )
 
-    def _ssh_run(command, **kwargs) -> Optional[Result]:
-        """Expects a stat command for the file and returns a file size."""
-        assert "stat" in command
-        assert remote_path in command
-        file_size = 5
-        return Result(stdout=str(file_size))
-
-    ssh_conn.run.side_effect = _ssh_run
-
-    def _ssh_get(remote, local) -> None:
-        """Mocks get in ssh to write to a file-like object."""
-        assert remote_path in remote
-        local.write(b"content")
-        local.write(b"more content")
-        return None
-
-    ssh_conn.get.side_effect = _ssh_get
+    response = ssh_pull_files(ssh_conn, remote_paths, 10)
 
-    with pytest.raises(PullFileError) as exc:
-        _ = ssh_pull_file(ssh_conn, remote_path, max_size)
-        assert "max" in str(exc)
+    assert response == {"/var/small": "small"}
 
 
-def test_ssh_pull_file_invalid_size_reported():
+def test_ssh_pull_files_invalid_archive():
     """
-    arrange: Mock an ssh connection for run. No need for the get method.
-       The run expects a stat command that returns a number (file size).
-    act: Call ssh_pull_file with a limit size smaller than what will be return
-       by the stat command.
-    assert: A PullFileError is raised.
+    arrange: Mock an ssh connection run method to output an empty archive.
+    act: Call ssh_pull_files.
+    assert: No files are returned.
     """
-    remote_path = "/var/whatever"
-    max_size = 10
     ssh_conn = MagicMock(spec=SSHConnection)
+    ssh_conn.run.return_value = Result(stdout="", exited=2)
 
-    def _ssh_run(command, **kwargs) -> Optional[Result]:
-        """Expects a stat command for the file and returns a file size."""
-        assert "stat" in command
-        assert remote_path in command
-        file_size = 20
-        return Result(stdout=str(file_size))
-
-    ssh_conn.run.side_effect = _ssh_run
+    response = ssh_pull_files(ssh_conn, (Path("/var/whatever"),), 10)
 
-    with pytest.raises(PullFileError) as exc:
-        _ = ssh_pull_file(ssh_conn, remote_path, max_size)
-    assert "too large" in str(exc)
+    assert response == {}
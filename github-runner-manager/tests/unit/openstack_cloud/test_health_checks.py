@@ -158,3 +158,35 @@ def test___run_health_check_runner_installed(
     ssh_conn.run.return_value = result_mock
 
     assert health_checks._run_health_check_runner_installed(ssh_conn, instance) == expected_result
+
+
+@pytest.mark.parametrize(
+    "return_code, expected_result",
+    [
+        pytest.param(0, None, id="runner process running"),
+        pytest.param(1, False, id="runner process not found"),
+        pytest.param(2, False, id="pgrep failure"),
+    ],
+)
+def test__run_health_check_runner_processes_running(
+    return_code: int, expected_result: bool | None
+):
+    """
+    arrange: Mock the exit code of the runner processes check.
+    act: Call _run_health_check_runner_processes_running.
+    assert: Expected health check result is returned.
+    """
+    ssh_conn = MagicMock(spec=SSHConnection)
+    result_mock = MagicMock(spec=invoke.runners.Result)
+    result_mock.ok = return_code == 0
+    result_mock.return_code = return_code
+    result_mock.stderr = ""
+    ssh_conn.run.return_value = result_mock
+
+    assert (
+        health_checks._run_health_check_runner_processes_running(ssh_conn, "test")
+        == expected_result
+    )
+    ssh_conn.run.assert_called_once_with(
+        health_checks._RUNNER_PROCESSES_CHECK_COMMAND, warn=True, timeout=30, hide=True
+    )
@@ -5,6 +5,8 @@ import datetime
 import itertools
 import logging
 import os
+import threading
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock
@@ -18,13 +20,17 @@ from openstack.network.v2.security_group import SecurityGroup as OpenstackSecuri
 from openstack.network.v2.security_group_rule import SecurityGroupRule
 
 from github_runner_manager.errors import OpenStackError
+from github_runner_manager.manager.models import InstanceID, RunnerMetadata
 from github_runner_manager.openstack_cloud.openstack_cloud import (
     _MIN_KEYPAIR_AGE_IN_SECONDS_BEFORE_DELETION,
+    _TEST_STRING,
     DEFAULT_SECURITY_RULES,
     OpenstackCloud,
     OpenStackCredentials,
+    OpenstackInstance,
     get_missing_security_rules,
 )
+from tests.unit.factories import openstack_factory
 
 FAKE_ARG = "fake"
 FAKE_PREFIX = "fake_prefix"
@@ -32,6 +38,33 @@ FAKE_PREFIX = "fake_prefix"
 logger = logging.getLogger(__name__)
 
 
+@pytest.fixture(name="openstack_cloud")
+def openstack_cloud_fixture(monkeypatch: pytest.MonkeyPatch) -> tuple[OpenstackCloud, MagicMock]:
+    """Create an OpenstackCloud with a mocked OpenStack connection, returned with the cloud."""
+    creds = OpenStackCredentials(
+        username=FAKE_ARG,
+        password=FAKE_ARG,
+        project_name=FAKE_ARG,
+        user_domain_name=FAKE_ARG,
+        project_domain_name=FAKE_ARG,
+        auth_url=FAKE_ARG,
+        region_name=FAKE_ARG,
+    )
+    # Mock expanduser as this is used in OpenstackCloud constructor
+    monkeypatch.setattr(
+        "github_runner_manager.openstack_cloud.openstack_cloud.Path.expanduser", MagicMock()
+    )
+    cloud = OpenstackCloud(creds, FAKE_PREFIX, FAKE_ARG)
+    openstack_connection_mock = MagicMock(spec=Connection)
+    openstack_connection_mock.__enter__.return_value = openstack_connection_mock
+    openstack_connection_mock.search_servers.return_value = []
+    monkeypatch.setattr(
+        "github_runner_manager.openstack_cloud.openstack_cloud.openstack.connect",
+        MagicMock(return_value=openstack_connection_mock),
+    )
+    return cloud, openstack_connection_mock
+
+
 @pytest.mark.parametrize(
     "public_method, args",
     [
@@ -230,6 +263,198 @@ def test_keypair_cleanup_freshly_created_keypairs(monkeypatch: pytest.MonkeyPatc
         assert keypair.name.removesuffix(".key") not in keypair_delete_calls
 
 
+def test_ssh_connection_reused(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    openstack_cloud: tuple[OpenstackCloud, MagicMock],
+):
+    """
+    arrange: An OpenStack instance with a key file and a mocked SSH connection.
+    act: Get the SSH connection twice, then delete the instance.
+    assert: The SSH connection is opened once, reused and closed on deletion.
+    """
+    cloud, _ = openstack_cloud
+    cloud._ssh_key_dir = tmp_path
+    instance = OpenstackInstance(
+        openstack_factory.ServerFactory(name=f"{FAKE_PREFIX}-test"), FAKE_PREFIX
+    )
+    (tmp_path / f"{instance.instance_id.name}.key").write_text("foobar")
+    ssh_connection_mock = MagicMock()
+    ssh_connection_mock.host = instance.addresses[0]
+    ssh_connection_mock.is_connected = True
+    ssh_connection_mock.run.return_value.stdout = _TEST_STRING
+    ssh_connection_cls_mock = MagicMock(return_value=ssh_connection_mock)
+    monkeypatch.setattr(
+        "github_runner_manager.openstack_cloud.openstack_cloud.SSHConnection",
+        ssh_connection_cls_mock,
+    )
+
+    first = cloud.get_ssh_connection(instance)
+    second = cloud.get_ssh_connection(instance)
+    cloud.delete_instance(instance.instance_id)
+
+    assert first is second
+    ssh_connection_cls_mock.assert_called_once()
+    connect_kwargs = ssh_connection_cls_mock.call_args.kwargs["connect_kwargs"]
+    assert connect_kwargs["key_filename"] == str(tmp_path / f"{instance.instance_id.name}.key")
+    assert not connect_kwargs["look_for_keys"]
+    assert not connect_kwargs["allow_agent"]
+    ssh_connection_mock.close.assert_called_once()
+    assert not openstack.connect.call_args.kwargs["load_yaml_config"]
+
+
+def test_cleanup_closes_stale_ssh_connections(
+    tmp_path: Path, openstack_cloud: tuple[OpenstackCloud, MagicMock]
+):
+    """
+    arrange: Cached SSH connections to an existing instance and to a removed instance.
+    act: Call cleanup.
+    assert: Only the SSH connection to the removed instance is closed and dropped.
+    """
+    cloud, openstack_connection_mock = openstack_cloud
+    cloud._ssh_key_dir = tmp_path
+    openstack_connection_mock.list_servers.return_value = [
+        openstack_factory.ServerFactory(name=f"{FAKE_PREFIX}-existing")
+    ]
+    openstack_connection_mock.list_keypairs.return_value = []
+    existing_connection = MagicMock()
+    removed_connection = MagicMock()
+    cloud._ssh_connections = {
+        f"{FAKE_PREFIX}-existing": existing_connection,
+        f"{FAKE_PREFIX}-removed": removed_connection,
+    }
+
+    cloud.cleanup()
+
+    assert cloud._ssh_connections == {f"{FAKE_PREFIX}-existing": existing_connection}
+    existing_connection.close.assert_not_called()
+    removed_connection.close.assert_called_once()
+
+
+def test_launch_instance_ensures_security_group_once(
+    monkeypatch: pytest.MonkeyPatch, openstack_cloud: tuple[OpenstackCloud, MagicMock]
+):
+    """
+    arrange: Mock the OpenStack connection.
+    act: Launch two instances with the same ingress ports, then another one after the cached
+        security group expired.
+    assert: The security group is looked up once for the first two instances, and again for the
+        last one.
+    """
+    cloud, openstack_connection_mock = openstack_cloud
+    monkeypatch.setattr(cloud, "_setup_keypair", MagicMock())
+    openstack_connection_mock.list_security_groups.return_value = [
+        OpenstackSecurityGroup(id="security-group-id", security_group_rules=[])
+    ]
+    openstack_connection_mock.create_server.side_effect = (
+        lambda name, **kwargs: openstack_factory.ServerFactory(name=name)
+    )
+
+    for suffix in ("first", "second"):
+        cloud.launch_instance(
+            metadata=RunnerMetadata(),
+            instance_id=InstanceID(prefix=FAKE_PREFIX, reactive=False, suffix=suffix),
+            server_config=MagicMock(),
+            cloud_init=FAKE_ARG,
+            ingress_tcp_ports=[8080],
+        )
+
+    openstack_connection_mock.list_security_groups.assert_called_once()
+    for create_call in openstack_connection_mock.create_server.call_args_list:
+        assert create_call.kwargs["security_groups"] == ["security-group-id"]
+
+    # The next batch of runners is created after the cached security group has expired.
+    monkeypatch.setattr(
+        "github_runner_manager.openstack_cloud.openstack_cloud._SECURITY_GROUP_CACHE_TTL_SECONDS",
+        0,
+    )
+    cloud.launch_instance(
+        metadata=RunnerMetadata(),
+        instance_id=InstanceID(prefix=FAKE_PREFIX, reactive=False, suffix="third"),
+        server_config=MagicMock(),
+        cloud_init=FAKE_ARG,
+        ingress_tcp_ports=[8080],
+    )
+
+    assert openstack_connection_mock.list_security_groups.call_count == 2
+
+
+def test_security_group_check_does_not_block_other_ports(
+    openstack_cloud: tuple[OpenstackCloud, MagicMock],
+):
+    """
+    arrange: Mock the OpenStack connection to block the first security group lookup.
+    act: Get the security group for a set of ports while the lookup for other ports is blocked.
+    assert: The security group for the second set of ports is returned without waiting.
+    """
+    cloud, openstack_connection_mock = openstack_cloud
+    first_lookup_started = threading.Event()
+    release_first_lookup = threading.Event()
+
+    def _list_security_groups(**kwargs) -> list[OpenstackSecurityGroup]:
+        """Block the first lookup until released."""
+        if not first_lookup_started.is_set():
+            first_lookup_started.set()
+            release_first_lookup.wait(timeout=30)
+        return [OpenstackSecurityGroup(id="security-group-id", security_group_rules=[])]
+
+    openstack_connection_mock.list_security_groups.side_effect = _list_security_groups
+
+    with ThreadPool(processes=2) as pool:
+        try:
+            blocked = pool.apply_async(
+                cloud._get_security_group_id, (openstack_connection_mock, [8080])
+            )
+            assert first_lookup_started.wait(timeout=10)
+            other = pool.apply_async(
+                cloud._get_security_group_id, (openstack_connection_mock, [9090])
+            )
+            assert other.get(timeout=5) == "security-group-id"
+        finally:
+            release_first_lookup.set()
+        assert blocked.get(timeout=10) == "security-group-id"
+
+
+def test_get_instances_reused_until_change(openstack_cloud: tuple[OpenstackCloud, MagicMock]):
+    """
+    arrange: Mock the OpenStack connection to list a server.
+    act: Get the instances twice, delete an instance and get the instances again.
+    assert: The servers are listed once before the deletion and once after.
+    """
+    cloud, openstack_connection_mock = openstack_cloud
+    openstack_connection_mock.list_servers.return_value = [
+        openstack_factory.ServerFactory(name=f"{FAKE_PREFIX}-test")
+    ]
+
+    first = cloud.get_instances()
+    second = cloud.get_instances()
+    cloud.delete_instance(first[0].instance_id)
+    cloud.get_instances()
+
+    assert first == second
+    assert openstack_connection_mock.list_servers.call_count == 2
+
+
+def test_get_instance_from_instances_listing(openstack_cloud: tuple[OpenstackCloud, MagicMock]):
+    """
+    arrange: Mock the OpenStack connection to list a server.
+    act: Get the instances, then get the listed instance and an unlisted one.
+    assert: The listed instance is taken from the listing, the unlisted one is searched for.
+    """
+    cloud, openstack_connection_mock = openstack_cloud
+    openstack_connection_mock.list_servers.return_value = [
+        openstack_factory.ServerFactory(name=f"{FAKE_PREFIX}-test")
+    ]
+
+    (listed,) = cloud.get_instances()
+    instance = cloud.get_instance(listed.instance_id)
+    unlisted = cloud.get_instance(InstanceID.build_from_name(FAKE_PREFIX, f"{FAKE_PREFIX}-other"))
+
+    assert instance is listed
+    assert unlisted is None
+    openstack_connection_mock.search_servers.assert_called_once()
+
+
 def _mock_datetime_now(monkeypatch):
     """Mock datetime.now() to return a fixed datetime."""
     now = datetime.datetime.now(datetime.timezone.utc)
@@ -13,7 +13,9 @@ import pytest
 from github_runner_manager.configuration import ProxyConfig, SupportServiceConfig, UserInfo
 from github_runner_manager.errors import OpenstackHealthCheckError
 from github_runner_manager.manager.cloud_runner_manager import (
+    CloudRunnerState,
     CodeInformation,
+    HealthState,
     PostJobMetrics,
     PostJobStatus,
     PreJobMetrics,
@@ -21,7 +23,6 @@ from github_runner_manager.manager.cloud_runner_manager import (
 )
 from github_runner_manager.manager.models import InstanceID, RunnerContext, RunnerMetadata
 from github_runner_manager.metrics import runner
-from github_runner_manager.metrics.runner import PullFileError
 from github_runner_manager.openstack_cloud import health_checks, openstack_cloud
 from github_runner_manager.openstack_cloud.constants import (
     POST_JOB_METRICS_FILE_NAME,
@@ -192,6 +193,39 @@ def test_cleanup_ignores_runners_with_health_check_errors(
         runner_metrics_mock.assert_any_call(unhealthy_id, ANY)
 
 
+def test_get_runners_filters_states_before_health_checks(
+    monkeypatch: pytest.MonkeyPatch, runner_manager: OpenStackRunnerManager
+):
+    """
+    arrange: Given an active and a stopped runner.
+    act: When get_runners is called filtering on the active state.
+    assert: Only the active runner is returned and health checked.
+    """
+    active_name = InstanceID(prefix=OPENSTACK_INSTANCE_PREFIX, reactive=False, suffix="a").name
+    stopped_name = InstanceID(prefix=OPENSTACK_INSTANCE_PREFIX, reactive=False, suffix="s").name
+    openstack_cloud_mock = MagicMock(spec=OpenstackCloud)
+    openstack_cloud_mock.get_instances.return_value = [
+        openstack_cloud.OpenstackInstance(
+            server=openstack_factory.ServerFactory(status=status, name=name),
+            prefix=OPENSTACK_INSTANCE_PREFIX,
+        )
+        for status, name in (("ACTIVE", active_name), ("STOPPED", stopped_name))
+    ]
+    runner_manager._openstack_cloud = openstack_cloud_mock
+    health_checks_mock = MagicMock(spec=health_checks)
+    health_checks_mock.check_runner.return_value = True
+    monkeypatch.setattr(
+        "github_runner_manager.openstack_cloud.openstack_runner_manager.health_checks",
+        health_checks_mock,
+    )
+
+    runners = runner_manager.get_runners(states=[CloudRunnerState.ACTIVE])
+
+    assert [runner.name for runner in runners] == [active_name]
+    assert runners[0].health == HealthState.HEALTHY
+    health_checks_mock.check_runner.assert_called_once()
+
+
 def _params_test_cleanup_extract_metrics():
     """Builds parametrized input for the test_cleanup_extract_metrics.
 
@@ -307,27 +341,21 @@ def test_cleanup_extract_metrics(
     act: Cleanup the runner for those metrics.
     assert: The expected RunnerMetrics object is obtained, or None if there should not be one.
     """
-    ssh_pull_file_mock = MagicMock()
+    ssh_pull_files_mock = MagicMock()
     monkeypatch.setattr(
-        "github_runner_manager.metrics.runner.ssh_pull_file",
-        ssh_pull_file_mock,
+        "github_runner_manager.metrics.runner.ssh_pull_files",
+        ssh_pull_files_mock,
     )
-
-    def _ssh_pull_file(remote_path, *args, **kwargs):
-        """Get a file from the runner."""
-        logger.info("ssh_pull_file: remote_path %s", remote_path)
-        res = None
-        if remote_path == str(PRE_JOB_METRICS_FILE_NAME):
-            res = pre_job_metrics
-        elif remote_path == str(POST_JOB_METRICS_FILE_NAME):
-            res = post_job_metrics
-        elif remote_path == str(RUNNER_INSTALLED_TS_FILE_NAME):
-            res = runner_installed_metrics
-        if res is None:
-            raise PullFileError("Nothing found or invalid file.")
-        return res
-
-    ssh_pull_file_mock.side_effect = _ssh_pull_file
+    # Files not found or invalid are missing from the pulled files.
+    ssh_pull_files_mock.return_value = {
+        str(remote_path): content
+        for remote_path, content in (
+            (RUNNER_INSTALLED_TS_FILE_NAME, runner_installed_metrics),
+            (PRE_JOB_METRICS_FILE_NAME, pre_job_metrics),
+            (POST_JOB_METRICS_FILE_NAME, post_job_metrics),
+        )
+        if content is not None
+    }
 
     names = [InstanceID(prefix=OPENSTACK_INSTANCE_PREFIX, reactive=False, suffix="unhealthy").name]
     openstack_cloud_mock = _create_openstack_cloud_mock(names)
@@ -51,8 +51,6 @@ def test_flush_runner_default_args(
     act: Run flush runner with no args.
     assert: Should flush idle runners.
     """
-    app.config["lock"] = lock
-
     response = client.post("/runner/flush")
 
     assert response.status_code == 204
@@ -69,8 +67,6 @@ def test_flush_runner_flush_busy(
     assert: Should flush both idle and busy runners.
 
     """
-    app.config["lock"] = lock
-
     response = client.post("/runner/flush?flush-busy=true")
 
     assert response.status_code == 204
@@ -86,8 +82,6 @@ def test_flush_runner_unlocked(
     act: Run flush runner.
     assert: The flush runner should run.
     """
-    app.config["lock"] = lock
-
     response = client.post("/runner/flush?flush-busy=false")
 
     assert response.status_code == 204
@@ -118,7 +112,6 @@ def test_check_runner(client: FlaskClient, lock: Lock, mock_runner_scaler: Magic
     act: HTTP Get to /runner/check
     assert: Returns the correct status code and content.
     """
-    app.config["lock"] = lock
     mock_runner_scaler.get_runner_info.return_value = RunnerInfo(
         online=1, busy=0, offline=0, unknown=0, runners=("mock_runner",), busy_runners=tuple()
     )
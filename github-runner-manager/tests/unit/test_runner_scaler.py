@@ -57,9 +57,9 @@ def mock_runner_manager_spawn_runners(
 ) -> tuple[InstanceID, ...]:
     """Mock _spawn_runners method of RunnerManager.
 
-    The _spawn_runners method uses multi-process, which copies the object, e.g., the mocks.
-    There is easy way to sync the state of the mocks object across processes. Replacing the
-    _spawn_runner to remove the multi-process.pool is an easier approach.
+    The _spawn_runners method uses a thread pool, which makes the order of the calls to the
+    mocks non-deterministic. Replacing the _spawn_runner to create the runners sequentially
+    keeps the tests deterministic.
 
     Args:
         create_runner_args: The arguments for the create_runner method.
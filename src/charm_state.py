@@ -4,6 +4,7 @@
 """State of the Charm."""
 
 import dataclasses
+import functools
 import json
 import logging
 import platform
@@ -26,14 +27,21 @@ from pydantic import (
     create_model_from_typeddict,
     validator,
 )
+from pydantic.json import pydantic_encoder
 
 from errors import MissingMongoDBError
 from utilities import get_env_var
 
 logger = logging.getLogger(__name__)
 
-ARCHITECTURES_ARM64 = {"aarch64", "arm64"}
-ARCHITECTURES_X86 = {"x86_64"}
+# The libyaml based loader is much faster than the pure Python one, but requires PyYAML to be
+# built with libyaml. The CSafeLoader attribute only exists in that case.
+_YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+if _YAML_SAFE_LOADER is yaml.SafeLoader:  # pragma: no cover
+    logger.warning("PyYAML is not built with libyaml, using the pure Python YAML loader")
+
+ARCHITECTURES_ARM64 = frozenset({"aarch64", "arm64"})
+ARCHITECTURES_X86 = frozenset({"x86_64"})
 
 CHARM_STATE_PATH = Path("charm_state.json")
 
@@ -78,7 +86,7 @@ class AnyHttpsUrl(AnyHttpUrl):
     allowed_schemes = {"https"}
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class GithubConfig:
     """Charm configuration related to GitHub.
 
@@ -132,6 +140,11 @@ class Arch(str, Enum):
     X64 = "x64"
 
 
+_ARCH_MAP: dict[str, Arch] = {arch: Arch.ARM64 for arch in ARCHITECTURES_ARM64} | {
+    arch: Arch.X64 for arch in ARCHITECTURES_X86
+}
+
+
 class CharmConfigInvalidError(Exception):
     """Raised when charm config is invalid.
 
@@ -148,6 +161,10 @@ class CharmConfigInvalidError(Exception):
         self.msg = msg
 
 
+# The KiB, MiB, GiB, TiB, PiB, EiB suffixes for storage size as specified in config.yaml.
+_STORAGE_SIZE_SUFFIXES = ("KiB", "MiB", "GiB", "TiB", "PiB", "EiB")
+
+
 def _valid_storage_size_str(size: str) -> bool:
     """Validate the storage size string.
 
@@ -157,13 +174,26 @@ def _valid_storage_size_str(size: str) -> bool:
     Return:
         Whether the string is valid.
     """
-    # Checks whether the string confirms to using the KiB, MiB, GiB, TiB, PiB,
-    # EiB suffix for storage size as specified in config.yaml.
-    valid_suffixes = {"KiB", "MiB", "GiB", "TiB", "PiB", "EiB"}
-    return size[-3:] in valid_suffixes and size[:-3].isdigit()
+    return size.endswith(_STORAGE_SIZE_SUFFIXES) and size[:-3].isdigit()
 
 
 WORD_ONLY_REGEX = re.compile("^[\\w\\-]+$")
+# Translation table deleting the non-alphanumeric characters allowed in WORD_ONLY_REGEX.
+_LABEL_NON_ALPHANUMERIC_TABLE = str.maketrans("", "", "_-")
+
+
+def _is_word_only(label: str) -> bool:
+    """Check whether a non-empty stripped string matches WORD_ONLY_REGEX, without regex.
+
+    Args:
+        label: The string to check.
+
+    Returns:
+        Whether the string consists of word characters and hyphens only.
+    """
+    # \w matches the characters of str.isalnum and the underscore.
+    alphanumeric = label.translate(_LABEL_NON_ALPHANUMERIC_TABLE)
+    return not alphanumeric or alphanumeric.isalnum()
 
 
 def _parse_labels(labels: str) -> tuple[str, ...]:
@@ -184,7 +214,7 @@ def _parse_labels(labels: str) -> tuple[str, ...]:
         stripped_label = label.strip()
         if not stripped_label:
             continue
-        if not WORD_ONLY_REGEX.match(stripped_label):
+        if not _is_word_only(stripped_label):
             invalid_labels.append(stripped_label)
         else:
             valid_labels.append(stripped_label)
@@ -278,6 +308,42 @@ class OpenStackCloudsYAML(TypedDict):
     clouds: dict[str, _OpenStackCloud]
 
 
+# Pydantic model to validate the OpenStackCloudsYAML TypedDict. Creating a model is costly, so it
+# is done once.
+_OpenStackCloudsYAMLModel = create_model_from_typeddict(OpenStackCloudsYAML)
+
+
+@functools.lru_cache(maxsize=2)
+def _parse_openstack_clouds_yaml(openstack_clouds_yaml_str: str) -> OpenStackCloudsYAML:
+    """Parse and validate the openstack clouds yaml string.
+
+    The config value rarely changes between hooks, so the result is cached on the raw string.
+    The cached dict must not be mutated; CharmConfig validation stores a copy of it.
+
+    Args:
+        openstack_clouds_yaml_str: The openstack clouds yaml config value.
+
+    Raises:
+        CharmConfigInvalidError: if the string is not a valid openstack clouds yaml.
+
+    Returns:
+        The openstack clouds yaml.
+    """
+    try:
+        openstack_clouds_yaml: OpenStackCloudsYAML = yaml.load(  # nosec
+            openstack_clouds_yaml_str, Loader=_YAML_SAFE_LOADER
+        )
+        # use Pydantic to validate TypedDict.
+        _OpenStackCloudsYAMLModel(**openstack_clouds_yaml)
+    except (yaml.YAMLError, TypeError) as exc:
+        logger.error(f"Invalid {OPENSTACK_CLOUDS_YAML_CONFIG_NAME} config: %s.", exc)
+        raise CharmConfigInvalidError(
+            f"Invalid {OPENSTACK_CLOUDS_YAML_CONFIG_NAME} config. Invalid yaml."
+        ) from exc
+
+    return openstack_clouds_yaml
+
+
 class CharmConfig(BaseModel):
     """General charm configuration.
 
@@ -357,19 +423,7 @@ class CharmConfig(BaseModel):
         if not openstack_clouds_yaml_str:
             raise CharmConfigInvalidError("No openstack_clouds_yaml")
 
-        try:
-            openstack_clouds_yaml: OpenStackCloudsYAML = yaml.safe_load(
-                cast(str, openstack_clouds_yaml_str)
-            )
-            # use Pydantic to validate TypedDict.
-            create_model_from_typeddict(OpenStackCloudsYAML)(**openstack_clouds_yaml)
-        except (yaml.YAMLError, TypeError) as exc:
-            logger.error(f"Invalid {OPENSTACK_CLOUDS_YAML_CONFIG_NAME} config: %s.", exc)
-            raise CharmConfigInvalidError(
-                f"Invalid {OPENSTACK_CLOUDS_YAML_CONFIG_NAME} config. Invalid yaml."
-            ) from exc
-
-        return openstack_clouds_yaml
+        return _parse_openstack_clouds_yaml(openstack_clouds_yaml_str)
 
     @validator("reconcile_interval")
     @classmethod
@@ -626,9 +680,12 @@ class UnsupportedArchitectureError(Exception):
         self.arch = arch
 
 
+@functools.lru_cache(maxsize=1)
 def _get_supported_arch() -> Arch:
     """Get current machine architecture.
 
+    The architecture does not change while the charm runs, so the result is cached.
+
     Raises:
         UnsupportedArchitectureError: if the current architecture is unsupported.
 
@@ -636,13 +693,9 @@ def _get_supported_arch() -> Arch:
         Arch: Current machine architecture.
     """
     arch = platform.machine()
-    match arch:
-        case arch if arch in ARCHITECTURES_ARM64:
-            return Arch.ARM64
-        case arch if arch in ARCHITECTURES_X86:
-            return Arch.X64
-        case _:
-            raise UnsupportedArchitectureError(arch=arch)
+    if (supported_arch := _ARCH_MAP.get(arch)) is None:
+        raise UnsupportedArchitectureError(arch=arch)
+    return supported_arch
 
 
 def _build_ssh_debug_connection_from_charm(charm: CharmBase) -> list[SSHDebugConnection]:
@@ -658,21 +711,23 @@ def _build_ssh_debug_connection_from_charm(charm: CharmBase) -> list[SSHDebugCon
     relations = charm.model.relations[DEBUG_SSH_INTEGRATION_NAME]
     if not relations or not (relation := relations[0]).units:
         return ssh_debug_connections
+    use_runner_http_proxy = cast(
+        bool, charm.config.get(USE_RUNNER_PROXY_FOR_TMATE_CONFIG_NAME, False)
+    )
     for unit in relation.units:
         relation_data = relation.data[unit]
-        if (
-            not (host := relation_data.get("host"))
-            or not (port := relation_data.get("port"))
-            or not (rsa_fingerprint := relation_data.get("rsa_fingerprint"))
-            or not (ed25519_fingerprint := relation_data.get("ed25519_fingerprint"))
-        ):
+        # Juju removes relation data keys set to an empty value, so a missing key is the only
+        # case of incomplete data.
+        try:
+            host = relation_data["host"]
+            port = relation_data["port"]
+            rsa_fingerprint = relation_data["rsa_fingerprint"]
+            ed25519_fingerprint = relation_data["ed25519_fingerprint"]
+        except KeyError:
             logger.warning(
                 "%s relation data for %s not yet ready.", DEBUG_SSH_INTEGRATION_NAME, unit.name
             )
             continue
-        use_runner_http_proxy = cast(
-            bool, charm.config.get(USE_RUNNER_PROXY_FOR_TMATE_CONFIG_NAME, False)
-        )
         ssh_debug_connections.append(
             # pydantic allows string to be passed as IPvAnyAddress and as int,
             # mypy complains about it
@@ -732,7 +787,7 @@ class ReactiveConfig(BaseModel):
 
 # Charm State is a list of all the configurations and states of the charm and
 # has therefore a lot of attributes.
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class CharmState:  # pylint: disable=too-many-instance-attributes
     """The charm state.
 
@@ -763,18 +818,26 @@ class CharmState:  # pylint: disable=too-many-instance-attributes
         Args:
             state: The state of the charm.
         """
-        state_dict = dataclasses.asdict(state)
-        # Convert pydantic object to python object serializable by json module.
-        state_dict["proxy_config"] = json.loads(state_dict["proxy_config"].json())
-        state_dict["runner_proxy_config"] = json.loads(state_dict["runner_proxy_config"].json())
-        state_dict["charm_config"] = json.loads(state_dict["charm_config"].json())
-        if state.reactive_config:
-            state_dict["reactive_config"] = json.loads(state_dict["reactive_config"].json())
-        state_dict["runner_config"] = json.loads(state_dict["runner_config"].json())
-        state_dict["ssh_debug_connections"] = [
-            debug_info.json() for debug_info in state_dict["ssh_debug_connections"]
-        ]
-        json_data = json.dumps(state_dict, ensure_ascii=False)
+        # The pydantic objects are serialized by the pydantic JSON encoder in a single pass,
+        # instead of copying the state and round-tripping each object through JSON. The SSH debug
+        # connections are stored as objects, they were stored as JSON strings in earlier revisions.
+        state_dict = {
+            "arch": state.arch,
+            "is_metrics_logging_available": state.is_metrics_logging_available,
+            "proxy_config": state.proxy_config,
+            "runner_proxy_config": state.runner_proxy_config,
+            "charm_config": state.charm_config,
+            "runner_config": state.runner_config,
+            "reactive_config": state.reactive_config,
+            "ssh_debug_connections": state.ssh_debug_connections,
+        }
+        json_data = json.dumps(state_dict, ensure_ascii=False, default=pydantic_encoder)
+        # Hooks often fire with an unchanged configuration, skip rewriting an identical state.
+        try:
+            if CHARM_STATE_PATH.read_text(encoding="utf-8") == json_data:
+                return
+        except OSError:
+            pass
         CHARM_STATE_PATH.write_text(json_data, encoding="utf-8")
 
     @classmethod
@@ -55,11 +55,8 @@ async def test_path_config_change(
     assert len(runner_names) == 1
     runner_name = runner_names[0]
 
-    runners_in_repo = github_repository.get_self_hosted_runners()
-    logger.info("runners in github repo: %s", list(runners_in_repo))
+    # The runners are paginated from the GitHub API, so they are fetched once.
+    runners_in_repo = list(github_repository.get_self_hosted_runners())
+    logger.info("runners in github repo: %s", runners_in_repo)
 
-    runner_in_repo_with_same_name = tuple(
-        filter(lambda runner: runner.name == runner_name, runners_in_repo)
-    )
-
-    assert len(runner_in_repo_with_same_name) == 1
+    assert sum(1 for runner in runners_in_repo if runner.name == runner_name) == 1
@@ -128,9 +128,12 @@ def skip_retry_fixture(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(utilities, "retry", patched_retry)
 
 
-@pytest.fixture(name="complete_charm_state")
+@pytest.fixture(name="complete_charm_state", scope="module")
 def complete_charm_state_fixture():
-    """Returns a fixture with a fully populated CharmState."""
+    """Returns a fixture with a fully populated CharmState.
+
+    The state is only read by the tests using it, so it is built and validated once per module.
+    """
     return charm_state.CharmState(
         arch="arm64",
         is_metrics_logging_available=False,
@@ -47,6 +47,24 @@ from errors import (
 from event_timer import EventTimer, TimerEnableError
 
 TEST_PROXY_SERVER_URL = "http://proxy.server:1234"
+# The content of the clouds.yaml is not checked by the tests, so it is serialized once.
+TEST_OPENSTACK_CLOUDS_YAML = yaml.safe_dump(
+    {
+        "clouds": {
+            "microstack": {
+                "auth": {
+                    "auth_url": "http://microstack.test:5000/v3",
+                    "project_name": "test-project",
+                    "project_domain_name": "test-project-domain",
+                    "username": "test-user",
+                    "user_domain_name": "test-user-domain",
+                    "password": "test-password",
+                },
+                "region_name": "test-region",
+            }
+        }
+    }
+)
 
 
 @pytest.fixture(name="mock_side_effects", scope="function")
@@ -142,26 +160,11 @@ def setup_charm_harness(monkeypatch: pytest.MonkeyPatch) -> Harness:
         Harness with patched RunnerManager instance.
     """
     harness = Harness(GithubRunnerCharm)
-    cloud_yaml = {
-        "clouds": {
-            "microstack": {
-                "auth": {
-                    "auth_url": secrets.token_hex(16),
-                    "project_name": secrets.token_hex(16),
-                    "project_domain_name": secrets.token_hex(16),
-                    "username": secrets.token_hex(16),
-                    "user_domain_name": secrets.token_hex(16),
-                    "password": secrets.token_hex(16),
-                },
-                "region_name": secrets.token_hex(16),
-            }
-        }
-    }
     harness.update_config(
         {
             PATH_CONFIG_NAME: "mock/repo",
             TOKEN_CONFIG_NAME: "mocktoken",
-            OPENSTACK_CLOUDS_YAML_CONFIG_NAME: yaml.safe_dump(cloud_yaml),
+            OPENSTACK_CLOUDS_YAML_CONFIG_NAME: TEST_OPENSTACK_CLOUDS_YAML,
             OPENSTACK_FLAVOR_CONFIG_NAME: "m1.builder",
             FLAVOR_LABEL_COMBINATIONS_CONFIG_NAME: "",
         }
@@ -403,51 +406,37 @@ def test_database_integration_events_trigger_reconciliation(
     reconciliation_mock.assert_called_once()
 
 
-# New tests should not be added here. This should be refactored to pytest over time.
-# New test should be written with pytest, similar to the above tests.
-# Consider to rewrite test with pytest if the tests below needs to be changed.
-class TestCharm(unittest.TestCase):
-    """Test the GithubRunner charm."""
-
-    @patch("pathlib.Path.mkdir")
-    @patch("pathlib.Path.write_text")
-    @patch("subprocess.run")
-    def test_on_update_status(self, run, wt, mkdir):
-        """
-        arrange: reconciliation event timer mocked to be \
-          1. active. \
-          2. inactive. \
-          3. inactive with error thrown for ensure_event_timer.
-        act: Emit update_status
-        assert:
-            1. ensure_event_timer is not called.
-            2. ensure_event_timer is called.
-            3. Charm throws error.
-        """
-        harness = Harness(GithubRunnerCharm)
-
-        harness.update_config({PATH_CONFIG_NAME: "mockorg/repo", TOKEN_CONFIG_NAME: "mocktoken"})
-        harness.begin()
-
-        event_timer_mock = MagicMock(spec=EventTimer)
-        harness.charm._event_timer = event_timer_mock
-        event_timer_mock.is_active.return_value = True
-
-        # 1. event timer is active
-        harness.charm.on.update_status.emit()
-        assert event_timer_mock.ensure_event_timer.call_count == 0
-        assert not isinstance(harness.charm.unit.status, BlockedStatus)
-
-        # 2. event timer is not active
-        event_timer_mock.is_active.return_value = False
+def test_on_update_status(harness: Harness):
+    """
+    arrange: reconciliation event timer mocked to be \
+      1. active. \
+      2. inactive. \
+      3. inactive with error thrown for ensure_event_timer.
+    act: Emit update_status
+    assert:
+        1. ensure_event_timer is not called.
+        2. ensure_event_timer is called.
+        3. Charm throws error.
+    """
+    event_timer_mock = MagicMock(spec=EventTimer)
+    harness.charm._event_timer = event_timer_mock
+    event_timer_mock.is_active.return_value = True
+
+    # 1. event timer is active
+    harness.charm.on.update_status.emit()
+    assert event_timer_mock.ensure_event_timer.call_count == 0
+    assert not isinstance(harness.charm.unit.status, BlockedStatus)
+
+    # 2. event timer is not active
+    event_timer_mock.is_active.return_value = False
+    harness.charm.on.update_status.emit()
+    event_timer_mock.ensure_event_timer.assert_called_once()
+    assert not isinstance(harness.charm.unit.status, BlockedStatus)
+
+    # 3. ensure_event_timer throws error.
+    event_timer_mock.ensure_event_timer.side_effect = TimerEnableError("mock error")
+    with pytest.raises(TimerEnableError):
         harness.charm.on.update_status.emit()
-        event_timer_mock.ensure_event_timer.assert_called_once()
-        assert not isinstance(harness.charm.unit.status, BlockedStatus)
-
-        # 3. ensure_event_timer throws error.
-        event_timer_mock.ensure_event_timer.side_effect = TimerEnableError("mock error")
-        with pytest.raises(TimerEnableError):
-            harness.charm.on.update_status.emit()
 
 
 def test_check_runners_action_with_errors():
@@ -665,26 +654,11 @@ def test_on_config_changed_openstack_clouds_yaml(mock_side_effects):
     assert: Charm is in blocked state.
     """
     harness = Harness(GithubRunnerCharm)
-    cloud_yaml = {
-        "clouds": {
-            "microstack": {
-                "auth": {
-                    "auth_url": secrets.token_hex(16),
-                    "project_name": secrets.token_hex(16),
-                    "project_domain_name": secrets.token_hex(16),
-                    "username": secrets.token_hex(16),
-                    "user_domain_name": secrets.token_hex(16),
-                    "password": secrets.token_hex(16),
-                },
-                "region_name": secrets.token_hex(16),
-            }
-        }
-    }
     harness.update_config(
         {
             PATH_CONFIG_NAME: "mockorg/repo",
             TOKEN_CONFIG_NAME: "mocktoken",
-            OPENSTACK_CLOUDS_YAML_CONFIG_NAME: yaml.safe_dump(cloud_yaml),
+            OPENSTACK_CLOUDS_YAML_CONFIG_NAME: TEST_OPENSTACK_CLOUDS_YAML,
             OPENSTACK_FLAVOR_CONFIG_NAME: "m1.big",
         }
     )
@@ -4,6 +4,7 @@ import json
 import logging
 import platform
 import secrets
+from typing import Iterator
 from unittest.mock import MagicMock
 
 import pytest
@@ -217,6 +218,16 @@ def test_parse_dockerhub_mirror(mirror_config: str, expected_mirror_url: str | N
     assert result == expected_mirror_url
 
 
+@pytest.fixture(autouse=True, name="clear_caches")
+def clear_caches_fixture() -> Iterator[None]:
+    """Clear the caches of the charm state functions, so no cached value leaks across tests."""
+    charm_state._parse_openstack_clouds_yaml.cache_clear()
+    charm_state._get_supported_arch.cache_clear()
+    yield
+    charm_state._parse_openstack_clouds_yaml.cache_clear()
+    charm_state._get_supported_arch.cache_clear()
+
+
 @pytest.fixture
 def valid_yaml_config():
     """Valid YAML config."""
@@ -305,6 +316,27 @@ def test_parse_openstack_clouds_config_valid(valid_yaml_config: str):
     assert "clouds" in result
 
 
+def test_parse_openstack_clouds_config_cached(
+    valid_yaml_config: str, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    arrange: Create a mock CharmBase instance with a valid OpenStack clouds YAML config.
+    act: Call _parse_openstack_clouds_config method twice with the mock CharmBase instance.
+    assert: The YAML is parsed only once.
+    """
+    mock_charm = MockGithubRunnerCharmFactory()
+    mock_charm.config[OPENSTACK_CLOUDS_YAML_CONFIG_NAME] = valid_yaml_config
+
+    yaml_load_mock = MagicMock(wraps=yaml.load)
+    monkeypatch.setattr(yaml, "load", yaml_load_mock)
+
+    first = CharmConfig._parse_openstack_clouds_config(mock_charm)
+    second = CharmConfig._parse_openstack_clouds_config(mock_charm)
+
+    assert first == second
+    yaml_load_mock.assert_called_once()
+
+
 @pytest.mark.parametrize("reconcile_interval", [(0), (1)])
 def test_check_reconcile_interval_invalid(reconcile_interval: int):
     """
@@ -572,6 +604,19 @@ def test__get_supported_arch_supported(
     assert charm_state._get_supported_arch() == expected_result
 
 
+def test__get_supported_arch_cached(monkeypatch: pytest.MonkeyPatch):
+    """
+    arrange: Mock the platform.machine() function to return a supported architecture.
+    act: Call the _get_supported_arch function twice.
+    assert: The architecture is only looked up once.
+    """
+    machine_mock = MagicMock(return_value="x86_64")
+    monkeypatch.setattr(platform, "machine", machine_mock)
+
+    assert charm_state._get_supported_arch() == charm_state._get_supported_arch() == Arch.X64
+    machine_mock.assert_called_once()
+
+
 def test_ssh_debug_connection_from_charm_no_connections():
     """
     arrange: Mock CharmBase instance without relation.
@@ -986,6 +1031,30 @@ def test_errror_flavor_config(
     assert expected_error_message in str(exc_info.value)
 
 
+def test_charm_state_store_unchanged_state(monkeypatch, tmp_path):
+    """
+    arrange: Mock CharmBase and necessary methods, with the state file in a temporary directory.
+    act: Call CharmState.from_charm twice with the same configuration.
+    assert: The charm state is written by the first call and not rewritten by the second call.
+    """
+    mock_charm = MockGithubRunnerCharmFactory()
+    mock_database = MagicMock(spec=DatabaseRequires)
+    monkeypatch.setattr(OpenstackImage, "from_charm", MagicMock(return_value=None))
+    monkeypatch.setattr(charm_state.ReactiveConfig, "from_database", MagicMock(return_value=None))
+    state_path = tmp_path / "charm_state.json"
+    monkeypatch.setattr(charm_state, "CHARM_STATE_PATH", state_path)
+
+    CharmState.from_charm(mock_charm, mock_database)
+    stored_state = state_path.read_text(encoding="utf-8")
+    write_text_spy = MagicMock()
+    monkeypatch.setattr(type(state_path), "write_text", write_text_spy)
+    CharmState.from_charm(mock_charm, mock_database)
+
+    assert json.loads(stored_state)["charm_config"]
+    assert state_path.read_text(encoding="utf-8") == stored_state
+    write_text_spy.assert_not_called()
+
+
 def test_charm_state__log_prev_state_redacts_sensitive_information(
     mock_charm_state_data: dict, caplog: pytest.LogCaptureFixture
 ):